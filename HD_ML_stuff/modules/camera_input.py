@@ -10,7 +10,7 @@ import logging
 class CameraCapture:
     """Handles camera input and frame capture"""
     
-    def __init__(self, camera_id=0, width=None, height=None, fps=None):
+    def __init__(self, camera_id=0, width=None, height=None, fps=None, fourcc=None):
         """
         Initialize camera capture
         
@@ -19,12 +19,14 @@ class CameraCapture:
             width: Frame width (optional)
             height: Frame height (optional)
             fps: Frames per second (optional)
+            fourcc: Four-character pixel format to request, e.g. "MJPG" (optional)
         """
         self.camera_id = camera_id
         self.capture = None
         self.width = width
         self.height = height
         self.fps = fps
+        self.fourcc = fourcc
         self.is_opened = False
         
         logging.info(f"Initializing camera with ID: {camera_id}")
@@ -38,6 +40,9 @@ class CameraCapture:
                 raise RuntimeError(f"Failed to open camera {self.camera_id}")
             
             # Set camera properties if specified
+            # Pixel format first: the format decides which resolutions/frame rates are offered
+            if self.fourcc:
+                self.capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
             if self.width:
                 self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
             if self.height:
@@ -80,21 +85,14 @@ class CameraCapture:
     
     def stop(self):
         """Stop camera capture and release resources"""
-        print("[DEBUG] === ENTERING Camera.stop() ===")
         try:
-            print("[DEBUG] Camera Step 0: Checking capture object")
             if self.capture is not None:
-                print("[DEBUG] Camera Step 1: Calling capture.release()")
                 self.capture.release()
-                print("[DEBUG] Camera Step 2: Capture released")
                 self.is_opened = False
                 logging.info("Camera stopped and resources released")
-                print("[DEBUG] Camera Step 3: Cleanup complete")
         except Exception as e:
-            print(f"[DEBUG] ERROR in Camera.stop(): {e}")
             logging.error(f"Error stopping camera: {e}")
             self.is_opened = False
-        print("[DEBUG] === EXITING Camera.stop() ===")
     
     def get_properties(self):
         """Get current camera properties"""
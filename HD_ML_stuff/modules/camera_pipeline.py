@@ -47,7 +47,8 @@ class CameraPipeline:
             camera_id=self.config.CAMERA_ID,
             width=self.config.CAMERA_WIDTH,
             height=self.config.CAMERA_HEIGHT,
-            fps=self.config.CAMERA_FPS
+            fps=self.config.CAMERA_FPS,
+            fourcc=getattr(self.config, 'CAMERA_FOURCC', None)
         )
         
         if not self.camera.start():
@@ -156,31 +157,19 @@ class CameraPipeline:
     
     def cleanup(self):
         """Cleanup resources"""
-        print("\n[DEBUG] === ENTERING CameraPipeline.cleanup() ===")
-        print("[DEBUG] CameraPipeline Step 0: Starting cleanup")
         logging.info("Cleaning up pipeline resources...")
         self.is_running = False
         
         try:
-            print("[DEBUG] CameraPipeline Step 1: Checking camera")
             if self.camera:
-                print("[DEBUG] CameraPipeline Step 2: Stopping camera")
                 self.camera.stop()
-                print("[DEBUG] CameraPipeline Step 3: Camera stopped")
         except Exception as e:
-            print(f"[DEBUG] ERROR stopping camera: {e}")
             logging.error(f"Error stopping camera: {e}")
         
         try:
-            print("[DEBUG] CameraPipeline Step 4: Checking display")
             if self.display:
-                print("[DEBUG] CameraPipeline Step 5: Destroying display")
                 self.display.destroy_all()
-                print("[DEBUG] CameraPipeline Step 6: Display destroyed")
         except Exception as e:
-            print(f"[DEBUG] ERROR destroying display: {e}")
             logging.error(f"Error destroying display: {e}")
         
-        print("[DEBUG] CameraPipeline Step 7: Cleanup complete")
-        logging.info("Pipeline cleanup complete")
-        print("[DEBUG] === EXITING CameraPipeline.cleanup() ===")
\ No newline at end of file
+        logging.info("Pipeline cleanup complete")
\ No newline at end of file
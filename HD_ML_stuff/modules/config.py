@@ -3,6 +3,8 @@ Configuration Module
 Central configuration for camera pipeline and proctoring system
 """
 
+from collections import namedtuple
+
 
 class ProctorConfig:
     """Pipeline configuration settings"""
@@ -12,6 +14,7 @@ class ProctorConfig:
     CAMERA_WIDTH = 1080
     CAMERA_HEIGHT = 720
     CAMERA_FPS = 30
+    CAMERA_FOURCC = "MJPG"  # Compressed USB stream; uncompressed YUYV cannot sustain this resolution at 30 FPS (None = driver default)
     
     # Display Settings
     WINDOW_NAME = "Proctoring System"
@@ -32,6 +35,12 @@ class ProctorConfig:
     FACE_MODEL_SELECTION = 1  # 0 for short-range (<2m), 1 for full-range (<5m)
     FACE_MIN_DETECTION_CONFIDENCE = 0.7  # Minimum confidence for face detection
     FACE_MIN_TRACKING_CONFIDENCE = 0.5  # Minimum confidence for face tracking
+    FACE_MAX_NUM_FACES = 5  # Faces the landmarker tracks per frame; lower values are cheaper but also cap the face count reported in multiple-face alerts
+    FACE_DETECT_MAX_INPUT_WIDTH = 640  # Downscale frames wider than this before face landmarking (None = full size)
+    FACE_DETECT_DELEGATE = "CPU"  # MediaPipe inference backend: "CPU" (XNNPACK) or "GPU"
+    FACE_DETECT_USE_OPENCL = False  # Resize/convert frames via OpenCV OpenCL (T-API); enable on machines with a GPU/iGPU
+    FACE_DETECT_REFRESH_INTERVAL = 1  # Re-run the landmarker at least every N frames, reusing landmarks in between while the face is still, e.g. 5 (1 = every frame; reused iris landmarks miss gaze shifts, so eye alerts lag)
+    FACE_DETECT_MOTION_THRESHOLD = 4.0  # Mean grey-level change in the face region that forces a fresh landmarker run
     
     # Face Mesh Visualization Settings
     SHOW_ALL_FACE_LANDMARKS = True  # Show all 478 face mesh points (set False for key points only)
@@ -83,3 +92,19 @@ class ProctorConfig:
             for key, value in cls.__dict__.items()
             if not key.startswith('_') and key.isupper()
         }
+    
+    @classmethod
+    def frozen(cls):
+        """
+        Snapshot the current settings into an immutable namedtuple
+        
+        Call once after the configuration block and pass the result to the
+        pipeline: reads become tuple slot lookups instead of class attribute
+        lookups, the pipeline cannot change its settings while running, and
+        later changes to ProctorConfig no longer leak into a running session.
+        
+        Returns:
+            namedtuple: Current configuration values
+        """
+        settings = cls.to_dict()
+        return namedtuple('FrozenProctorConfig', settings)(**settings)
@@ -3,8 +3,71 @@ Display Module
 Handles window creation and frame display
 """
 
+import functools
 import cv2
 import logging
+import numpy as np
+
+
+@functools.lru_cache(maxsize=256)
+def render_text_sprite(lines, color):
+    """
+    Rasterize overlay text once into a glyph sprite for blit_text_sprite
+    
+    Args:
+        lines: Tuple of (text, dy, font_scale, thickness) per line, where dy is the
+               baseline offset from the first line (0 for the first line)
+        color: BGR text color
+        
+    Returns:
+        tuple: (sprite, mask, origin) - BGR glyph image, boolean glyph mask,
+               and the first line's baseline origin (x, y) inside the sprite
+    """
+    # A few pixels of margin so strokes past the nominal text box are not clipped
+    margin = 3
+    sizes = [
+        cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+        for text, _, font_scale, thickness in lines
+    ]
+    ascent = max(text_h - line[1] for ((_, text_h), _), line in zip(sizes, lines)) + margin
+    descent = max(line[1] + baseline for (_, baseline), line in zip(sizes, lines)) + margin
+    width = max(text_w for (text_w, _), _ in sizes) + 2 * margin
+    
+    mask_img = np.zeros((ascent + descent, width), dtype=np.uint8)
+    for text, dy, font_scale, thickness in lines:
+        cv2.putText(mask_img, text, (margin, ascent + dy), cv2.FONT_HERSHEY_SIMPLEX, font_scale, 255, thickness)
+    
+    mask = mask_img > 0
+    sprite = np.zeros(mask_img.shape + (3,), dtype=np.uint8)
+    sprite[mask] = color
+    return sprite, mask, (margin, ascent)
+
+
+def blit_text_sprite(frame, lines, color, origin):
+    """
+    Draw overlay text in place by copying its cached glyph pixels, equivalent to
+    cv2.putText(frame, text, (x, y + dy), FONT_HERSHEY_SIMPLEX, font_scale, color, thickness)
+    for each line
+    
+    Args:
+        frame: Frame to draw on (modified in place)
+        lines: Tuple of (text, dy, font_scale, thickness) per line, as for render_text_sprite
+        color: BGR text color (a tuple, it is part of the cache key)
+        origin: (x, y) baseline origin of the first line
+    """
+    x, y = origin
+    sprite, mask, (sprite_x, sprite_y) = render_text_sprite(lines, color)
+    x0 = x - sprite_x
+    y0 = y - sprite_y
+    if x0 < 0 or y0 < 0:
+        # The sprite would start off-frame; let putText clip the glyphs instead
+        for text, dy, font_scale, thickness in lines:
+            cv2.putText(frame, text, (x, y + dy), cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, thickness)
+        return
+    
+    roi = frame[y0:y0 + sprite.shape[0], x0:x0 + sprite.shape[1]]
+    h, w = roi.shape[:2]
+    np.copyto(roi, sprite[:h, :w], where=mask[:h, :w, None])
 
 
 class DisplayWindow:
@@ -22,6 +85,10 @@ class DisplayWindow:
         self.fullscreen = fullscreen
         self.is_initialized = False
         
+        # FPS label, reformatted only when the value changes (about once per second)
+        self._fps_str = ""
+        self._last_fps = None
+        
         logging.info(f"Initializing display window: {window_name}")
     
     def create_window(self):
@@ -49,7 +116,7 @@ class DisplayWindow:
         Display a frame in the window
         
         Args:
-            frame: The frame to display
+            frame: The frame to display (the FPS text is drawn onto it in place)
             fps: Optional FPS to display on frame
             
         Returns:
@@ -65,21 +132,22 @@ class DisplayWindow:
         
         # Add FPS text if provided
         if fps is not None:
-            display_frame = frame.copy()
+            if fps != self._last_fps:
+                self._fps_str = f"FPS: {fps:.1f}"
+                self._last_fps = fps
+            
             cv2.putText(
-                display_frame,
-                f"FPS: {fps:.1f}",
+                frame,
+                self._fps_str,
                 (10, 30),
                 cv2.FONT_HERSHEY_SIMPLEX,
                 1,
                 (0, 255, 0),
                 2
             )
-        else:
-            display_frame = frame
         
         try:
-            cv2.imshow(self.window_name, display_frame)
+            cv2.imshow(self.window_name, frame)
             return True
         except Exception as e:
             logging.error(f"Error displaying frame: {e}")
@@ -113,23 +181,15 @@ class DisplayWindow:
     
     def destroy_all(self):
         """Destroy all OpenCV windows"""
-        print("[DEBUG] === ENTERING Display.destroy_all() ===")
         try:
-            print("[DEBUG] Display Step 0: Calling cv2.destroyAllWindows()")
             cv2.destroyAllWindows()
-            print("[DEBUG] Display Step 1: destroyAllWindows() returned")
             # Add waitKey to flush OpenCV event queue and prevent hanging
-            print("[DEBUG] Display Step 2: Calling cv2.waitKey(1)")
             cv2.waitKey(1)
-            print("[DEBUG] Display Step 3: waitKey(1) returned")
             self.is_initialized = False
             logging.info("All display windows destroyed")
-            print("[DEBUG] Display Step 4: Cleanup complete")
         except Exception as e:
-            print(f"[DEBUG] ERROR in Display.destroy_all(): {e}")
             logging.error(f"Error destroying windows: {e}")
             self.is_initialized = False
-        print("[DEBUG] === EXITING Display.destroy_all() ===")
     
     def set_position(self, x, y):
         """Set window position on screen"""
@@ -4,13 +4,136 @@ Uses MediaPipe face mesh landmarks to detect and track eye movements
 Analyzes pupil position and eye geometry for risk assessment
 """
 
-import logging
+import collections
 import cv2
 import numpy as np
 import json
 from datetime import datetime
 from pathlib import Path
 from .base_detector import BaseDetector
+from .display import blit_text_sprite
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when Numba is not installed"""
+        def decorator(func):
+            return func
+        return decorator
+
+try:
+    import orjson
+    
+    def _json_line(entry):
+        """Serialize one eye-movement log entry as a newline-terminated JSON line (bytes)"""
+        return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    def _json_line(entry):
+        """Serialize one eye-movement log entry as a newline-terminated JSON line (bytes)"""
+        return (json.dumps(entry) + '\n').encode('utf-8')
+
+# Eye-movement log entries are buffered and written out in batches of this size
+EYE_LOG_FLUSH_EVERY = 64
+
+# Risk status codes returned by _risk_kernel, indexing RISK_STATUS
+RISK_CLOSED, RISK_DOWN, RISK_UP, RISK_SIDE, RISK_SAFE = range(5)
+# Eye aspect ratio above which an eye counts as open
+EYE_OPEN_EAR = 0.15
+
+RISK_STATUS = ("EYE CLOSED", "LOOKING DOWN (RISK)", "LOOKING UP (THINKING)",
+               "LOOKING SIDE (RISK)", "CENTER (SAFE)")
+
+
+@njit(cache=True, fastmath=True)
+def _risk_kernel(outer_x, inner_x, top_y, bottom_y, iris_x, iris_y,
+                 calibration_offset, threshold, horizontal_min, horizontal_max):
+    """
+    Numeric core of calculate_risk (JIT-compiled when Numba is available)
+    
+    Returns:
+        tuple: (risk_code, score, horizontal_ratio, raw_vertical_ratio)
+    """
+    # Calculate eye dimensions
+    eye_width = abs(outer_x - inner_x) + 1e-6  # Avoid div/0
+    
+    # Vertical ratio: how far up/down from center (normalized by width for consistency)
+    eye_center_y = (top_y + bottom_y) / 2.0
+    raw_vertical_ratio = (iris_y - eye_center_y) / eye_width
+    decision_ratio = raw_vertical_ratio - calibration_offset
+    
+    # Horizontal ratio: position along the eye width
+    horizontal_ratio = (iris_x - inner_x) / eye_width
+    
+    if decision_ratio > threshold:
+        return RISK_DOWN, decision_ratio, horizontal_ratio, raw_vertical_ratio
+    elif decision_ratio < -threshold:
+        return RISK_UP, abs(decision_ratio), horizontal_ratio, raw_vertical_ratio
+    elif horizontal_ratio < horizontal_min or horizontal_ratio > horizontal_max:
+        return RISK_SIDE, abs(horizontal_ratio - 0.5) * 2.0, horizontal_ratio, raw_vertical_ratio
+    return RISK_SAFE, 1.0 - abs(decision_ratio), horizontal_ratio, raw_vertical_ratio
+
+
+@njit(cache=True, fastmath=True)
+def _both_eyes_kernel(eye_pts, calib_left, calib_right, threshold,
+                      horizontal_min, horizontal_max, frame_w, frame_h):
+    """
+    Eye geometry and risk for both eyes of one face (JIT-compiled when Numba is available)
+    
+    Args:
+        eye_pts: (10, 2) pixel coordinates, Left then Right (outer, inner, top, bottom, iris) per eye
+        
+    Returns:
+        tuple: (geometry, codes) - geometry is a (2, 10) float64 array of
+               bbox x1, y1, x2, y2, eye_width, eye_height, EAR, score,
+               horizontal_ratio, raw_vertical_ratio per eye; codes index RISK_STATUS
+    """
+    geometry = np.empty((2, 10), dtype=np.float64)
+    codes = np.empty(2, dtype=np.int64)
+    for eye in range(2):
+        base = eye * 5
+        outer_x = float(eye_pts[base, 0])
+        outer_y = float(eye_pts[base, 1])
+        inner_x = float(eye_pts[base + 1, 0])
+        inner_y = float(eye_pts[base + 1, 1])
+        top_x = float(eye_pts[base + 2, 0])
+        top_y = float(eye_pts[base + 2, 1])
+        bottom_x = float(eye_pts[base + 3, 0])
+        bottom_y = float(eye_pts[base + 3, 1])
+        iris_x = float(eye_pts[base + 4, 0])
+        iris_y = float(eye_pts[base + 4, 1])
+        
+        # Eye bounding box, clipped to the frame
+        geometry[eye, 0] = min(max(min(outer_x, inner_x, top_x, bottom_x) - 10.0, 0.0), frame_w)
+        geometry[eye, 1] = min(max(min(outer_y, inner_y, top_y, bottom_y) - 10.0, 0.0), frame_h)
+        geometry[eye, 2] = min(max(max(outer_x, inner_x, top_x, bottom_x) + 10.0, 0.0), frame_w)
+        geometry[eye, 3] = min(max(max(outer_y, inner_y, top_y, bottom_y) + 10.0, 0.0), frame_h)
+        
+        # Eye aspect ratio for blink detection
+        eye_width = abs(outer_x - inner_x)
+        eye_height = abs(top_y - bottom_y)
+        ear = eye_height / (eye_width + 1e-6)
+        geometry[eye, 4] = eye_width
+        geometry[eye, 5] = eye_height
+        geometry[eye, 6] = ear
+        
+        # Risk rules live in _risk_kernel; closed eyes carry no gaze information
+        if ear > EYE_OPEN_EAR:
+            calibration_offset = calib_left if eye == 0 else calib_right
+            code, score, horizontal_ratio, raw_vertical_ratio = _risk_kernel(
+                outer_x, inner_x, top_y, bottom_y, iris_x, iris_y,
+                calibration_offset, threshold, horizontal_min, horizontal_max
+            )
+        else:
+            code, score, horizontal_ratio, raw_vertical_ratio = RISK_CLOSED, 0.0, 0.0, 0.0
+        codes[eye] = code
+        geometry[eye, 7] = score
+        geometry[eye, 8] = horizontal_ratio
+        geometry[eye, 9] = raw_vertical_ratio
+    return geometry, codes
 
 
 class EyeMovementDetector(BaseDetector):
@@ -48,6 +171,15 @@ class EyeMovementDetector(BaseDetector):
             'iris_center': 473  # Right iris center landmark
         }
         
+        # Flat gather index for both eyes: Left (outer, inner, top, bottom, iris), then Right
+        self._eye_names = ('Left', 'Right')
+        keys = ('outer', 'inner', 'top', 'bottom', 'iris_center')
+        self._eye_idx = np.array(
+            [self.left_eye_indices[k] for k in keys] + [self.right_eye_indices[k] for k in keys],
+            dtype=np.int32
+        )
+        self._eye_corner_idx = self._eye_idx.reshape(2, 5)[:, :4].ravel()
+        
         # Risk analysis thresholds
         self.vertical_threshold = 0.15
         self.horizontal_min = 0.3
@@ -61,6 +193,15 @@ class EyeMovementDetector(BaseDetector):
             'eye_contour': (255, 128, 0)  # Orange
         }
         
+        # Landmark markers drawn per eye: (landmark key, radius, color)
+        self._circle_specs = (
+            ('outer', 3, self.keypoint_colors['outer']),
+            ('inner', 3, self.keypoint_colors['inner']),
+            ('top', 2, self.keypoint_colors['eye_contour']),
+            ('bottom', 2, self.keypoint_colors['eye_contour']),
+            ('iris', 4, self.keypoint_colors['iris'])
+        )
+        
         # Risk status colors
         self.risk_colors = {
             'SAFE': (0, 255, 0),       # Green
@@ -69,13 +210,24 @@ class EyeMovementDetector(BaseDetector):
             'CLOSED': (128, 128, 128)   # Gray
         }
         
+        # Box color for every status calculate_risk can return; anything else draws as SAFE
+        self._status_to_color = {}
+        for status in RISK_STATUS:
+            if "RISK" in status:
+                self._status_to_color[status] = self.risk_colors['RISK']
+            elif "THINKING" in status:
+                self._status_to_color[status] = self.risk_colors['THINKING']
+            elif "CLOSED" in status:
+                self._status_to_color[status] = self.risk_colors['CLOSED']
+        
         # Calibration state
         self.is_calibrated = False
         self.should_calibrate = False
         self.calibration_offsets = {}  # {'Left': 0.0, 'Right': 0.0}
         
-        # Eye movement logging
-        self.eye_movement_logger = None
+        # Eye movement logging (buffered JSONL file, written in batches from _log_ring)
+        self._eye_log_fp = None
+        self._log_ring = collections.deque(maxlen=256)
         self.eye_log_file = None
         self.session_id = None
         
@@ -88,6 +240,11 @@ class EyeMovementDetector(BaseDetector):
         Returns:
             bool: True (always successful)
         """
+        # Warm up the risk kernel so JIT compilation is not paid on the first frame
+        if NUMBA_AVAILABLE:
+            _risk_kernel(0.0, 1.0, 0.0, 1.0, 0.5, 0.5, 0.0, 0.15, 0.3, 0.7)
+            _both_eyes_kernel(np.zeros((10, 2), dtype=np.int32), 0.0, 0.0, 0.15, 0.3, 0.7, 640.0, 480.0)
+        
         self.initialized = True
         self.logger.info("Eye Movement Detector ready (using MediaPipe face mesh)")
         return True
@@ -109,17 +266,11 @@ class EyeMovementDetector(BaseDetector):
             self.session_id = session_id
             self.eye_log_file = log_path / f"eye_movements_{session_id}.jsonl"
             
-            # Create logger
-            self.eye_movement_logger = logging.getLogger(f"EyeMovement_{session_id}")
-            self.eye_movement_logger.setLevel(logging.INFO)
-            self.eye_movement_logger.handlers.clear()
+            # Close a previous session's log before starting a new one
+            self._close_eye_log()
             
-            # File handler for eye movement logs
-            file_handler = logging.FileHandler(self.eye_log_file)
-            file_handler.setLevel(logging.INFO)
-            file_formatter = logging.Formatter('%(message)s')  # JSON lines format
-            file_handler.setFormatter(file_formatter)
-            self.eye_movement_logger.addHandler(file_handler)
+            # Buffered JSON lines file; entries are batched through _log_ring
+            self._eye_log_fp = open(self.eye_log_file, 'ab', buffering=1 << 16)
             
             # Log header
             header = {
@@ -128,7 +279,7 @@ class EyeMovementDetector(BaseDetector):
                 'timestamp': datetime.now().isoformat(),
                 'log_file': str(self.eye_log_file)
             }
-            self.eye_movement_logger.info(json.dumps(header))
+            self._eye_log_fp.write(_json_line(header))
             
             self.logger.info(f"Eye movement logger initialized: {self.eye_log_file}")
             return True
@@ -136,6 +287,20 @@ class EyeMovementDetector(BaseDetector):
         except Exception as e:
             self.logger.error(f"Error setting up eye movement logger: {e}")
             return False
+    
+    def _flush_eye_log(self):
+        """Write all buffered eye-movement log entries to the log file"""
+        if self._eye_log_fp is not None and self._log_ring:
+            self._eye_log_fp.writelines(self._log_ring)
+        self._log_ring.clear()
+    
+    def _close_eye_log(self):
+        """Flush buffered entries and close the eye-movement log file"""
+        if self._eye_log_fp is None:
+            return
+        self._flush_eye_log()
+        self._eye_log_fp.close()
+        self._eye_log_fp = None
             
     def trigger_calibration(self):
         """Trigger calibration on next frame"""
@@ -149,6 +314,28 @@ class EyeMovementDetector(BaseDetector):
         self.calibration_offsets = {}
         self.logger.info("Calibration reset")
     
+    @staticmethod
+    def _face_points(face_data):
+        """
+        Get a face's (N, 2) landmark pixel array
+        
+        Prefers the array FaceDetector attaches as 'landmarks_xy'; otherwise converts
+        the legacy landmark dicts once and caches the array on the face.
+        
+        Returns:
+            np.ndarray or None: Landmark array, or None if the face has no landmarks
+        """
+        pts = face_data.get('landmarks_xy')
+        if pts is None:
+            landmarks = face_data.get('landmarks')
+            if landmarks:
+                pts = np.fromiter(
+                    (c for lm in landmarks for c in (lm['x'], lm['y'])),
+                    dtype=np.int32, count=2 * len(landmarks)
+                ).reshape(-1, 2)
+                face_data['landmarks_xy'] = pts
+        return pts
+    
     def detect(self, frame, face_meshes):
         """
         Detect eyes and extract eye data from MediaPipe face mesh
@@ -160,87 +347,7 @@ class EyeMovementDetector(BaseDetector):
         Returns:
             list: List of eye detections with landmarks and analysis
         """
-        if not self.initialized:
-            self.logger.warning("Detector not initialized")
-            return []
-        
-        if not face_meshes:
-            return []
-        
-        h, w, _ = frame.shape
-        detections = []
-        
-        # Process each face mesh
-        for face_data in face_meshes:
-            landmarks = face_data.get('landmarks')
-            
-            if not landmarks or len(landmarks) < 468:
-                self.logger.debug("Face mesh missing landmarks (need at least 468 points)")
-                continue
-            
-            # Process both eyes
-            for eye_name, eye_indices in [('Left', self.left_eye_indices), ('Right', self.right_eye_indices)]:
-                try:
-                    # Extract eye landmarks
-                    outer = landmarks[eye_indices['outer']]
-                    inner = landmarks[eye_indices['inner']]
-                    top = landmarks[eye_indices['top']]
-                    bottom = landmarks[eye_indices['bottom']]
-                    
-                    # Get iris center if available (landmarks 468-477 for iris)
-                    iris_idx = eye_indices['iris_center']
-                    if iris_idx < len(landmarks):
-                        iris = landmarks[iris_idx]
-                    else:
-                        # Fallback: estimate iris center from eye corners
-                        iris = {
-                            'x': int((outer['x'] + inner['x']) / 2),
-                            'y': int((outer['y'] + inner['y']) / 2),
-                            'z': 0.0
-                        }
-                    
-                    # Calculate eye bounding box
-                    eye_points = [outer, inner, top, bottom]
-                    x_coords = [p['x'] for p in eye_points]
-                    y_coords = [p['y'] for p in eye_points]
-                    
-                    bbox_x1 = max(0, min(x_coords) - 10)
-                    bbox_y1 = max(0, min(y_coords) - 10)
-                    bbox_x2 = min(w, max(x_coords) + 10)
-                    bbox_y2 = min(h, max(y_coords) + 10)
-                    
-                    # Check if eye is open (vertical distance)
-                    eye_height = abs(top['y'] - bottom['y'])
-                    eye_width = abs(outer['x'] - inner['x'])
-                    
-                    # Eye aspect ratio for blink detection
-                    ear = eye_height / (eye_width + 1e-6)
-                    is_open = ear > 0.15  # Threshold for eye being open
-                    
-                    # Store detection
-                    detection = {
-                        'eye_name': eye_name,
-                        'bbox': (bbox_x1, bbox_y1, bbox_x2, bbox_y2),
-                        'landmarks': {
-                            'outer': (outer['x'], outer['y']),
-                            'inner': (inner['x'], inner['y']),
-                            'top': (top['x'], top['y']),
-                            'bottom': (bottom['x'], bottom['y']),
-                            'iris': (iris['x'], iris['y'])
-                        },
-                        'eye_width': eye_width,
-                        'eye_height': eye_height,
-                        'eye_aspect_ratio': ear,
-                        'is_open': is_open
-                    }
-                    
-                    detections.append(detection)
-                    
-                except Exception as e:
-                    self.logger.debug(f"Error processing {eye_name} eye: {e}")
-                    continue
-
-        return detections 
+        return [analyzed[0] for analyzed in self._analyze_frame(frame, face_meshes)]
     
     def calculate_risk(self, detection):
         """
@@ -253,52 +360,26 @@ class EyeMovementDetector(BaseDetector):
             tuple: (status, score, horizontal_ratio, vertical_ratio)
         """
         try:
-            eye_name = detection['eye_name']
-            
             # Check if eye is closed
             if not detection.get('is_open', True):
-                return "EYE CLOSED", 0.0, 0.0, 0.0
+                return RISK_STATUS[RISK_CLOSED], 0.0, 0.0, 0.0
             
             landmarks = detection['landmarks']
-            outer = landmarks['outer']
-            inner = landmarks['inner']
-            top = landmarks['top']
-            bottom = landmarks['bottom']
-            iris = landmarks['iris']
-            
-            # Calculate eye dimensions
-            eye_width = abs(outer[0] - inner[0]) + 1e-6  # Avoid div/0
-            eye_height = abs(top[1] - bottom[1]) + 1e-6
+            outer_x = landmarks['outer'][0]
+            inner_x = landmarks['inner'][0]
+            top_y = landmarks['top'][1]
+            bottom_y = landmarks['bottom'][1]
+            iris_x, iris_y = landmarks['iris']
             
-            # Eye center (horizontal and vertical)
-            eye_center_x = (outer[0] + inner[0]) / 2
-            eye_center_y = (top[1] + bottom[1]) / 2
-            
-            # Iris position relative to eye center
-            iris_x, iris_y = iris
-            
-            # Vertical ratio: how far up/down from center (normalized by width for consistency)
-            raw_vertical_ratio = (iris_y - eye_center_y) / eye_width
-            
-            # Apply calibration offset
-            calibration_offset = self.calibration_offsets.get(eye_name, 0.0)
-            corrected_vertical_ratio = raw_vertical_ratio - calibration_offset
-            
-            # Horizontal ratio: position along the eye width
-            horizontal_ratio = (iris_x - inner[0]) / eye_width
-            
-            # Determine status
-            decision_ratio = corrected_vertical_ratio
+            calibration_offset = self.calibration_offsets.get(detection['eye_name'], 0.0)
             threshold = 0.12 if self.is_calibrated else self.vertical_threshold
             
-            if decision_ratio > threshold:
-                return "LOOKING DOWN (RISK)", decision_ratio, horizontal_ratio, raw_vertical_ratio
-            elif decision_ratio < -threshold:
-                return "LOOKING UP (THINKING)", abs(decision_ratio), horizontal_ratio, raw_vertical_ratio
-            elif horizontal_ratio < self.horizontal_min or horizontal_ratio > self.horizontal_max:
-                return "LOOKING SIDE (RISK)", abs(horizontal_ratio - 0.5) * 2, horizontal_ratio, raw_vertical_ratio
-            else:
-                return "CENTER (SAFE)", 1.0 - abs(decision_ratio), horizontal_ratio, raw_vertical_ratio
+            code, score, horizontal_ratio, raw_vertical_ratio = _risk_kernel(
+                float(outer_x), float(inner_x), float(top_y), float(bottom_y),
+                float(iris_x), float(iris_y), float(calibration_offset), float(threshold),
+                float(self.horizontal_min), float(self.horizontal_max)
+            )
+            return RISK_STATUS[code], score, horizontal_ratio, raw_vertical_ratio
         
         except Exception as e:
             self.logger.error(f"Error in risk calculation: {e}")
@@ -306,28 +387,21 @@ class EyeMovementDetector(BaseDetector):
     
     def draw_eye_detection(self, frame, detection, draw_landmarks=True):
         """
-        Draw eye detection with bounding box and landmarks
+        Draw eye detection with bounding box and landmarks (in place)
         
         Args:
-            frame: Input frame
+            frame: Input frame, annotated in place
             detection: Detection dictionary with landmarks
             draw_landmarks: Whether to draw landmarks
             
         Returns:
-            Annotated frame
+            Annotated frame (the same array as frame)
         """
-        annotated_frame = frame.copy()
+        annotated_frame = frame
+        circle = cv2.circle
         
         # Get risk status color
-        risk_status = detection.get('risk_status', 'SAFE')
-        if "RISK" in risk_status:
-            box_color = self.risk_colors['RISK']
-        elif "THINKING" in risk_status:
-            box_color = self.risk_colors['THINKING']
-        elif "CLOSED" in risk_status:
-            box_color = self.risk_colors['CLOSED']
-        else:
-            box_color = self.risk_colors['SAFE']
+        box_color = self._status_to_color.get(detection.get('risk_status'), self.risk_colors['SAFE'])
         
         # Draw bounding box
         x1, y1, x2, y2 = detection['bbox']
@@ -335,56 +409,47 @@ class EyeMovementDetector(BaseDetector):
         
         # Draw landmarks
         if draw_landmarks and detection.get('landmarks'):
+            # Landmarks are int pixel tuples from detect, passed to cv2 as-is
             landmarks = detection['landmarks']
             
-            # Draw eye corners
-            outer = landmarks['outer']
-            inner = landmarks['inner']
-            top = landmarks['top']
-            bottom = landmarks['bottom']
-            iris = landmarks['iris']
-            
-            # Draw outer and inner corners
-            cv2.circle(annotated_frame, (int(outer[0]), int(outer[1])), 3, self.keypoint_colors['outer'], -1)
-            cv2.circle(annotated_frame, (int(inner[0]), int(inner[1])), 3, self.keypoint_colors['inner'], -1)
-            
-            # Draw top and bottom
-            cv2.circle(annotated_frame, (int(top[0]), int(top[1])), 2, self.keypoint_colors['eye_contour'], -1)
-            cv2.circle(annotated_frame, (int(bottom[0]), int(bottom[1])), 2, self.keypoint_colors['eye_contour'], -1)
-            
-            # Draw iris center (larger)
-            cv2.circle(annotated_frame, (int(iris[0]), int(iris[1])), 4, self.keypoint_colors['iris'], -1)
+            # Draw eye corners, top/bottom and iris center (larger)
+            for key, radius, color in self._circle_specs:
+                circle(annotated_frame, landmarks[key], radius, color, -1)
             
             # Draw line between corners
-            cv2.line(annotated_frame, (int(inner[0]), int(inner[1])), 
-                    (int(outer[0]), int(outer[1])), (255, 255, 255), 1)
+            cv2.line(annotated_frame, landmarks['inner'], landmarks['outer'], (255, 255, 255), 1)
         
         # Draw risk status label
         if 'risk_status' in detection:
             label = detection['risk_status']
             score = detection.get('risk_score', 0.0)
             
-            # Background for label
             label_text = f"{detection['eye_name']}: {label}"
-            score_text = f"Score: {score:.2f}"
             
-            cv2.putText(annotated_frame, label_text,
-                       (x1, y1 - 20), cv2.FONT_HERSHEY_SIMPLEX, 
-                       0.5, box_color, 2)
-            cv2.putText(annotated_frame, score_text,
-                       (x1, y1 - 5), cv2.FONT_HERSHEY_SIMPLEX, 
-                       0.4, box_color, 1)
+            # Both label lines share one cached sprite; rounding the score to 0.05 keeps the
+            # number of distinct labels (and sprites) small
+            score_text = f"Score: {round(float(score) * 20) / 20:.2f}"
+            blit_text_sprite(
+                annotated_frame,
+                ((label_text, 0, 0.5, 2), (score_text, 15, 0.4, 1)),
+                box_color,
+                (x1, y1 - 20)
+            )
         
         return annotated_frame
     
-    def process_frame(self, frame, face_meshes=None, draw=True):
+    def process_frame(self, frame, face_meshes=None, draw=True, include_ratios=True):
         """
         Process frame: detect eyes and calculate risk
         
+        Annotations are drawn directly onto the passed frame; callers that need the
+        original pixels must pass a copy.
+        
         Args:
-            frame: Input frame
+            frame: Input frame, annotated in place
             face_meshes: List of face mesh data from FaceDetector (required)
             draw: Whether to draw annotations
+            include_ratios: Whether to store horizontal/vertical gaze ratios in each detection
             
         Returns:
             tuple: (processed_frame, detection_results)
@@ -392,13 +457,19 @@ class EyeMovementDetector(BaseDetector):
         if not self.enabled:
             return frame, {"enabled": False}
         
-        if face_meshes is None:
-            face_meshes = []
+        # Detect eyes and classify their risk using face mesh data
+        analyzed = self._analyze_frame(frame, face_meshes) if face_meshes else []
         
-        processed_frame = frame.copy()
+        # Nothing to analyze or draw (a pending calibration waits for eyes)
+        if not analyzed:
+            return frame, {
+                "detector": self.name,
+                "num_eyes": 0,
+                "detections": [],
+                "calibrated": self.is_calibrated
+            }
         
-        # Detect eyes using face mesh data
-        detections = self.detect(frame, face_meshes)
+        processed_frame = frame
         
         # Handle calibration flag
         if self.should_calibrate:
@@ -408,46 +479,44 @@ class EyeMovementDetector(BaseDetector):
         # Analyze risk for each detection
         risk_detections = []
         
-        for detection in detections:
-            # Calculate risk status
-            status, score, h_ratio, raw_v_ratio = self.calculate_risk(detection)
-            
-            # Perform calibration if requested
-            eye_name = detection['eye_name']
-            if self.should_calibrate:
+        detections = [item[0] for item in analyzed]
+        risks = [item[1:] for item in analyzed]
+        
+        # Perform calibration if requested, then reclassify with the new offsets
+        if self.should_calibrate:
+            calculate_risk = self.calculate_risk
+            calibrated_risks = []
+            for detection, (_, _, _, raw_v_ratio) in zip(detections, risks):
+                eye_name = detection['eye_name']
                 self.calibration_offsets[eye_name] = raw_v_ratio
                 self.logger.info(f"Calibrated {eye_name} eye with offset: {raw_v_ratio:.4f}")
-                
-                # Recalculate with new calibration
-                status, score, h_ratio, raw_v_ratio = self.calculate_risk(detection)
-            
+                calibrated_risks.append(calculate_risk(detection))
+            risks = calibrated_risks
+        
+        # Bind per-call constants before the per-detection loop
+        draw_eye_detection = self.draw_eye_detection
+        log_eye_movement = self._log_eye_movement if self._eye_log_fp is not None else None
+        
+        # One timestamp per frame, shared by every eye's log entry
+        frame_timestamp = datetime.now().isoformat() if log_eye_movement and detections else None
+        
+        for detection, (status, score, h_ratio, raw_v_ratio) in zip(detections, risks):
             # Add risk analysis to detection
             detection['risk_status'] = status
             detection['risk_score'] = score
-            detection['horizontal_ratio'] = h_ratio
-            detection['vertical_ratio'] = raw_v_ratio
+            if include_ratios:
+                detection['horizontal_ratio'] = h_ratio
+                detection['vertical_ratio'] = raw_v_ratio
             
             risk_detections.append(detection)
             
-            # Log eye movement to dedicated logger
-            if self.eye_movement_logger:
-                eye_log_entry = {
-                    'timestamp': datetime.now().isoformat(),
-                    'eye_name': eye_name,
-                    'risk_status': status,
-                    'risk_score': float(score),
-                    'horizontal_ratio': float(h_ratio),
-                    'vertical_ratio': float(raw_v_ratio),
-                    'calibrated': self.is_calibrated,
-                    'calibration_offset': self.calibration_offsets.get(eye_name, 0.0),
-                    'eye_aspect_ratio': float(detection.get('eye_aspect_ratio', 0.0)),
-                    'is_open': detection.get('is_open', True)
-                }
-                self.eye_movement_logger.info(json.dumps(eye_log_entry))
+            # Buffer the eye movement log entry; it is written out in batches
+            if log_eye_movement:
+                log_eye_movement(detection, status, score, h_ratio, raw_v_ratio, frame_timestamp)
             
             # Draw detection
             if draw:
-                processed_frame = self.draw_eye_detection(processed_frame, detection)
+                processed_frame = draw_eye_detection(processed_frame, detection)
         
         if self.should_calibrate:
             self.should_calibrate = False
@@ -462,23 +531,111 @@ class EyeMovementDetector(BaseDetector):
         
         return processed_frame, detection_results
     
+    def _log_eye_movement(self, detection, status, score, h_ratio, raw_v_ratio, timestamp):
+        """Buffer one eye's log entry; entries are written out in batches of EYE_LOG_FLUSH_EVERY"""
+        eye_name = detection['eye_name']
+        eye_log_entry = {
+            'timestamp': timestamp,
+            'eye_name': eye_name,
+            'risk_status': status,
+            'risk_score': float(score),
+            'horizontal_ratio': float(h_ratio),
+            'vertical_ratio': float(raw_v_ratio),
+            'calibrated': self.is_calibrated,
+            'calibration_offset': self.calibration_offsets.get(eye_name, 0.0),
+            'eye_aspect_ratio': float(detection.get('eye_aspect_ratio', 0.0)),
+            'is_open': detection.get('is_open', True)
+        }
+        self._log_ring.append(_json_line(eye_log_entry))
+        if len(self._log_ring) >= EYE_LOG_FLUSH_EVERY:
+            self._flush_eye_log()
+    
+    def _analyze_frame(self, frame, face_meshes):
+        """
+        Detect eyes and calculate risk for one frame
+        
+        Returns:
+            list: (detection, status, score, h_ratio, raw_v_ratio) per eye
+        """
+        if not self.initialized:
+            self.logger.warning("Detector not initialized")
+            return []
+        
+        if not face_meshes:
+            return []
+        
+        h, w = frame.shape[:2]
+        eye_idx = self._eye_idx
+        offsets = self.calibration_offsets
+        calib_left = float(offsets.get('Left', 0.0))
+        calib_right = float(offsets.get('Right', 0.0))
+        threshold = float(0.12 if self.is_calibrated else self.vertical_threshold)
+        horizontal_min = float(self.horizontal_min)
+        horizontal_max = float(self.horizontal_max)
+        
+        analyzed = []
+        for face_data in face_meshes:
+            pts = self._face_points(face_data)
+            
+            if pts is None or len(pts) < 468:
+                self.logger.debug("Face mesh missing landmarks (need at least 468 points)")
+                continue
+            
+            # Gather outer/inner/top/bottom/iris for both eyes in one indexing call
+            if len(pts) > eye_idx.max():
+                eye_pts = pts[eye_idx]
+            else:
+                # Fallback: estimate iris center from eye corners
+                eye_pts = np.empty((2, 5, 2), dtype=np.int32)
+                eye_pts[:, :4] = pts[self._eye_corner_idx].reshape(2, 4, 2)
+                eye_pts[:, 4] = (eye_pts[:, 0] + eye_pts[:, 1]) // 2
+                eye_pts = eye_pts.reshape(10, 2)
+            
+            # One kernel call covers geometry and risk for both eyes
+            geometry, codes = _both_eyes_kernel(
+                eye_pts, calib_left, calib_right, threshold,
+                horizontal_min, horizontal_max, float(w), float(h)
+            )
+            points = eye_pts.reshape(2, 5, 2).tolist()
+            
+            for i, eye_name in enumerate(self._eye_names):
+                x1, y1, x2, y2, eye_width, eye_height, ear, score, h_ratio, v_ratio = geometry[i].tolist()
+                outer, inner, top, bottom, iris = points[i]
+                detection = {
+                    'eye_name': eye_name,
+                    'bbox': (int(x1), int(y1), int(x2), int(y2)),
+                    # Int pixel tuples, ready to hand to cv2 drawing calls
+                    'landmarks': {
+                        'outer': tuple(outer),
+                        'inner': tuple(inner),
+                        'top': tuple(top),
+                        'bottom': tuple(bottom),
+                        'iris': tuple(iris)
+                    },
+                    'eye_width': int(eye_width),
+                    'eye_height': int(eye_height),
+                    'eye_aspect_ratio': ear,
+                    'is_open': ear > EYE_OPEN_EAR
+                }
+                analyzed.append((detection, RISK_STATUS[codes[i]], score, h_ratio, v_ratio))
+        
+        return analyzed
+    
     def cleanup(self):
         """Release resources and close eye movement logger"""
         try:
             # Close eye movement logger
-            if self.eye_movement_logger:
+            if self._eye_log_fp is not None:
                 # Log session end
                 end_entry = {
                     'type': 'session_end',
                     'session_id': self.session_id,
                     'timestamp': datetime.now().isoformat()
                 }
-                self.eye_movement_logger.info(json.dumps(end_entry))
+                self._log_ring.append(_json_line(end_entry))
                 
-                # Remove handlers
-                for handler in self.eye_movement_logger.handlers[:]:
-                    handler.close()
-                    self.eye_movement_logger.removeHandler(handler)
+                # Write remaining buffered entries and close the file
+                self._close_eye_log()
                 
                 self.logger.info(f"Eye movement log saved: {self.eye_log_file}")
             
@@ -19,6 +19,26 @@ except ImportError:
     logging.warning("MediaPipe not available. Install with: pip install mediapipe")
 
 
+class FaceMeshes(list):
+    """
+    Result of FaceDetector.detect
+    
+    Behaves as the list of per-face dicts callers already use
+    (face_meshes[0]['bbox'], len(face_meshes), ...), and additionally exposes
+    the same data as stacked arrays for vectorized consumers:
+    
+        bboxes: np.ndarray (N, 4) int32 of padded (x, y, w, h) boxes
+        landmarks: np.ndarray (N, K, 2) int32 of pixel landmark coordinates
+    
+    Each face dict also carries 'landmarks_xy', a view of its row in landmarks.
+    """
+    
+    def __init__(self, faces=(), bboxes=None, landmarks=None):
+        super().__init__(faces)
+        self.bboxes = bboxes if bboxes is not None else np.empty((0, 4), dtype=np.int32)
+        self.landmarks = landmarks if landmarks is not None else np.empty((0, 0, 2), dtype=np.int32)
+
+
 class FaceDetector(BaseDetector):
     """
     Face detection using MediaPipe Tasks Vision API
@@ -32,7 +52,13 @@ class FaceDetector(BaseDetector):
         enabled=True,
         model_selection=1,  # Legacy parameter, kept for compatibility
         min_detection_confidence=0.5,
-        min_tracking_confidence=0.5
+        min_tracking_confidence=0.5,
+        max_input_width=None,
+        refresh_interval=1,
+        motion_threshold=4.0,
+        max_num_faces=5,
+        use_opencl=False,
+        delegate='CPU'
     ):
         """
         Initialize MediaPipe Tasks Vision face landmarker
@@ -43,6 +69,12 @@ class FaceDetector(BaseDetector):
             model_selection: Legacy parameter (not used in Tasks Vision API)
             min_detection_confidence: Minimum confidence for detection (0.0-1.0)
             min_tracking_confidence: Minimum confidence for tracking (0.0-1.0)
+            max_input_width: Downscale wider frames to this width before landmarking (None = full size)
+            refresh_interval: Max frames to reuse the last landmarks while the face is still (1 = every frame)
+            motion_threshold: Mean absolute grey-level change in the face region that counts as movement
+            max_num_faces: Maximum number of faces the landmarker tracks per frame
+            use_opencl: Run resize/colour conversion through OpenCV's OpenCL T-API when available
+            delegate: MediaPipe inference backend, 'CPU' or 'GPU'
         """
         super().__init__(name, enabled)
         
@@ -52,6 +84,17 @@ class FaceDetector(BaseDetector):
         self.model_selection = model_selection
         self.min_detection_confidence = min_detection_confidence
         self.min_tracking_confidence = min_tracking_confidence
+        self.max_input_width = max_input_width
+        self.max_num_faces = max_num_faces
+        self.delegate = delegate
+        
+        # OpenCL preprocessing (T-API); only useful with a GPU/iGPU OpenCL device
+        self.use_opencl = bool(use_opencl) and cv2.ocl.haveOpenCL()
+        if self.use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+            self.logger.info("Using OpenCL for face detector preprocessing")
+        elif use_opencl:
+            self.logger.warning("OpenCL requested but not available, using CPU preprocessing")
         
         # MediaPipe Tasks Vision face landmarker
         self.face_landmarker = None
@@ -59,6 +102,17 @@ class FaceDetector(BaseDetector):
         # Frame counter for timestamp generation
         self.frame_count = 0
         
+        # Reusable downscale and RGB conversion buffers (reallocated only when the input size changes)
+        self._small_buf = None
+        self._rgb_buf = None
+        
+        # Temporal reuse: skip the landmarker while the face region is unchanged
+        self.refresh_interval = max(1, int(refresh_interval))
+        self.motion_threshold = motion_threshold
+        self._last_meshes = None
+        self._last_roi_thumb = None
+        self._frames_since_mesh = 0
+        
         self.logger.info(f"Initializing MediaPipe Tasks Vision Face Landmarker")
     
     def load_model(self, model_path=None):
@@ -84,11 +138,14 @@ class FaceDetector(BaseDetector):
             self.logger.info(f"Loading face landmarker model from: {model_path}")
             
             # Configure FaceLandmarker with base options
-            base_options = python.BaseOptions(model_asset_path=str(model_file))
+            base_options = python.BaseOptions(
+                model_asset_path=str(model_file),
+                delegate=self._get_delegate()
+            )
             options = vision.FaceLandmarkerOptions(
                 base_options=base_options,
                 running_mode=vision.RunningMode.VIDEO,
-                num_faces=5,
+                num_faces=self.max_num_faces,
                 min_face_detection_confidence=self.min_detection_confidence,
                 min_face_presence_confidence=self.min_tracking_confidence,
                 min_tracking_confidence=self.min_tracking_confidence,
@@ -105,6 +162,18 @@ class FaceDetector(BaseDetector):
             self.logger.error(f"Error loading MediaPipe Tasks Vision Face Landmarker: {e}")
             return False
     
+    def _get_delegate(self):
+        """
+        Map the configured delegate name to MediaPipe's enum
+        
+        Returns:
+            python.BaseOptions.Delegate: GPU if requested, otherwise CPU
+        """
+        if str(self.delegate).upper() == 'GPU':
+            self.logger.info("Running face landmarker on the GPU delegate")
+            return python.BaseOptions.Delegate.GPU
+        return python.BaseOptions.Delegate.CPU
+    
     def detect(self, frame):
         """
         Detect faces in frame and return face meshes using Face Landmarker
@@ -113,17 +182,46 @@ class FaceDetector(BaseDetector):
             frame: Input frame (numpy array in BGR format)
             
         Returns:
-            list: List of face mesh results with landmarks and bounding boxes
+            FaceMeshes: List of face mesh results with landmarks and bounding boxes,
+                        plus stacked bboxes/landmarks arrays
         """
         if not self.initialized:
             self.logger.warning("Detector not initialized")
-            return []
+            return FaceMeshes()
         
         try:
-            # Convert BGR to RGB for MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             h, w = frame.shape[:2]
             
+            # Reuse the previous landmarks if the face has not moved since the last run
+            if self.refresh_interval > 1:
+                if self._can_reuse_last(frame):
+                    self._frames_since_mesh += 1
+                    return self._last_meshes
+                self._last_meshes = None
+            
+            # The landmark model runs at a fixed low resolution, so feed it a downscaled
+            # frame; landmarks are normalized and still map back using the full w, h
+            if self.use_opencl:
+                rgb_frame = self._preprocess_opencl(frame, w, h)
+            else:
+                detect_frame = frame
+                if self.max_input_width and w > self.max_input_width:
+                    small_h = int(round(h * self.max_input_width / w))
+                    small_shape = (small_h, self.max_input_width, frame.shape[2])
+                    if self._small_buf is None or self._small_buf.shape != small_shape:
+                        self._small_buf = np.empty(small_shape, dtype=frame.dtype)
+                    detect_frame = cv2.resize(frame, (self.max_input_width, small_h),
+                                              dst=self._small_buf, interpolation=cv2.INTER_AREA)
+                
+                # Convert BGR to RGB for MediaPipe into the reusable buffer
+                if self._rgb_buf is None or self._rgb_buf.shape != detect_frame.shape:
+                    self._rgb_buf = np.empty_like(detect_frame)
+                self._rgb_buf.flags.writeable = True
+                rgb_frame = cv2.cvtColor(detect_frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+            
+            # Read-only input lets MediaPipe wrap the buffer instead of copying it
+            rgb_frame.flags.writeable = False
+            
             # Create MediaPipe Image
             mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
             
@@ -135,60 +233,116 @@ class FaceDetector(BaseDetector):
             landmarker_result = self.face_landmarker.detect_for_video(mp_image, timestamp_ms)
             
             if not landmarker_result.face_landmarks:
-                return []
+                return self._remember(frame, FaceMeshes())
             
-            face_meshes = []
+            faces = []
+            bbox_rows = []
+            points_list = []
+            scale = np.array([w, h], dtype=np.float64)
+            padding = 20
             
             # Process each detected face
             for face_landmarks in landmarker_result.face_landmarks:
-                # Convert normalized landmarks to pixel coordinates
-                landmarks = []
-                x_coords = []
-                y_coords = []
+                if not face_landmarks:
+                    continue
                 
-                for landmark in face_landmarks:
-                    x_px = int(landmark.x * w)
-                    y_px = int(landmark.y * h)
-                    landmarks.append({
-                        'x': x_px,
-                        'y': y_px,
-                        'z': landmark.z if hasattr(landmark, 'z') else 0.0
-                    })
-                    x_coords.append(x_px)
-                    y_coords.append(y_px)
+                # Convert normalized landmarks to pixel coordinates in one vectorized step
+                points = (np.array([(lm.x, lm.y) for lm in face_landmarks], dtype=np.float64) * scale).astype(np.int32)
+                z_values = [lm.z if hasattr(lm, 'z') else 0.0 for lm in face_landmarks]
                 
-                # Calculate bounding box from landmarks
-                if x_coords and y_coords:
-                    x_min = max(0, min(x_coords))
-                    y_min = max(0, min(y_coords))
-                    x_max = min(w, max(x_coords))
-                    y_max = min(h, max(y_coords))
-                    
-                    # Add padding to bounding box
-                    padding = 20
-                    x_min = max(0, x_min - padding)
-                    y_min = max(0, y_min - padding)
-                    x_max = min(w, x_max + padding)
-                    y_max = min(h, y_max + padding)
-                    
-                    face_data = {
-                        'bbox': {
-                            'x': x_min,
-                            'y': y_min,
-                            'w': x_max - x_min,
-                            'h': y_max - y_min
-                        },
-                        'confidence': 1.0,  # Face Landmarker doesn't provide per-face confidence
-                        'landmarks': landmarks
-                    }
-                    
-                    face_meshes.append(face_data)
+                # Calculate bounding box from landmarks, with padding
+                x_min = max(0, int(points[:, 0].min()) - padding)
+                y_min = max(0, int(points[:, 1].min()) - padding)
+                x_max = min(w, int(points[:, 0].max()) + padding)
+                y_max = min(h, int(points[:, 1].max()) + padding)
+                
+                bbox_rows.append((x_min, y_min, x_max - x_min, y_max - y_min))
+                points_list.append(points)
+                
+                faces.append({
+                    'bbox': {
+                        'x': x_min,
+                        'y': y_min,
+                        'w': x_max - x_min,
+                        'h': y_max - y_min
+                    },
+                    'confidence': 1.0,  # Face Landmarker doesn't provide per-face confidence
+                    # Legacy per-landmark dicts, kept for existing consumers
+                    'landmarks': [
+                        {'x': x, 'y': y, 'z': z}
+                        for (x, y), z in zip(points.tolist(), z_values)
+                    ]
+                })
+            
+            if not faces:
+                return self._remember(frame, FaceMeshes())
             
-            return face_meshes
+            bboxes = np.array(bbox_rows, dtype=np.int32)
+            landmarks = np.stack(points_list)
+            for face_data, face_points in zip(faces, landmarks):
+                face_data['landmarks_xy'] = face_points
+            
+            return self._remember(frame, FaceMeshes(faces, bboxes=bboxes, landmarks=landmarks))
             
         except Exception as e:
             self.logger.error(f"Error detecting faces: {e}")
-            return []
+            return FaceMeshes()
+    
+    def _preprocess_opencl(self, frame, w, h):
+        """
+        Downscale and convert a BGR frame to RGB on the OpenCL device
+        
+        Args:
+            frame: Input frame (BGR)
+            w, h: Frame width and height
+            
+        Returns:
+            np.ndarray RGB frame in host memory, ready for MediaPipe
+        """
+        u_frame = cv2.UMat(frame)
+        if self.max_input_width and w > self.max_input_width:
+            small_h = int(round(h * self.max_input_width / w))
+            u_frame = cv2.resize(u_frame, (self.max_input_width, small_h), interpolation=cv2.INTER_AREA)
+        # MediaPipe needs host memory, so download only the final RGB image
+        return cv2.cvtColor(u_frame, cv2.COLOR_BGR2RGB).get()
+    
+    def _roi_thumbnail(self, frame, face_meshes):
+        """
+        Tiny greyscale thumbnail of the region the faces occupy, used as a motion signature
+        
+        Args:
+            frame: Input frame (BGR)
+            face_meshes: FaceMeshes whose boxes define the region (whole frame if empty)
+            
+        Returns:
+            np.ndarray (32, 32) uint8 thumbnail
+        """
+        roi = frame
+        if len(face_meshes) > 0:
+            boxes = face_meshes.bboxes
+            x1 = int(boxes[:, 0].min())
+            y1 = int(boxes[:, 1].min())
+            x2 = int((boxes[:, 0] + boxes[:, 2]).max())
+            y2 = int((boxes[:, 1] + boxes[:, 3]).max())
+            if x2 > x1 and y2 > y1:
+                roi = frame[y1:y2, x1:x2]
+        thumb = cv2.resize(roi, (32, 32), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+    
+    def _remember(self, frame, face_meshes):
+        """Cache a fresh landmarker result and its motion signature for reuse"""
+        if self.refresh_interval > 1:
+            self._last_meshes = face_meshes
+            self._last_roi_thumb = self._roi_thumbnail(frame, face_meshes)
+            self._frames_since_mesh = 0
+        return face_meshes
+    
+    def _can_reuse_last(self, frame):
+        """Whether the cached landmarks are still valid for this frame"""
+        if self._last_meshes is None or self._frames_since_mesh + 1 >= self.refresh_interval:
+            return False
+        thumb = self._roi_thumbnail(frame, self._last_meshes)
+        return cv2.absdiff(thumb, self._last_roi_thumb).mean() < self.motion_threshold
     
     def draw_faces(self, frame, face_meshes, color=(0, 255, 0), thickness=2, show_all_landmarks=False, show_landmark_numbers=False):
         """
@@ -293,20 +447,13 @@ class FaceDetector(BaseDetector):
     
     def cleanup(self):
         """Release MediaPipe FaceLandmarker resources"""
-        print(f"[DEBUG] === ENTERING {self.name}.cleanup() ===")
         if self.face_landmarker:
             try:
-                print(f"[DEBUG] {self.name} Step 0: Releasing face_landmarker")
                 # MediaPipe FaceLandmarker doesn't have explicit close, set to None for GC
                 self.face_landmarker = None
-                print(f"[DEBUG] {self.name} Step 1: Set to None")
                 self.initialized = False
                 self.logger.info(f"{self.name} - MediaPipe FaceLandmarker resources released")
-                print(f"[DEBUG] {self.name} Step 2: Cleanup complete")
             except Exception as e:
-                print(f"[DEBUG] ERROR in {self.name}.cleanup(): {e}")
                 self.logger.error(f"Error cleaning up {self.name}: {e}")
         else:
-            print(f"[DEBUG] {self.name}: No resources to clean")
             self.logger.info(f"{self.name} cleanup complete (no resources loaded)")
-        print(f"[DEBUG] === EXITING {self.name}.cleanup() ===")
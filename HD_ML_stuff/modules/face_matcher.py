@@ -411,22 +411,14 @@ class FaceMatcher(BaseDetector):
     
     def cleanup(self):
         """Release DeepFace model and cached embeddings"""
-        print(f"[DEBUG] === ENTERING {self.name}.cleanup() ===")
         try:
-            print(f"[DEBUG] {self.name} Step 0: Clearing embeddings")
             # Clear cached embeddings
             self.participant_embedding = None
-            print(f"[DEBUG] {self.name} Step 1: participant_embedding = None")
             self.embedding_dim = None
-            print(f"[DEBUG] {self.name} Step 2: embedding_dim = None")
             self.initialized = False
-            print(f"[DEBUG] {self.name} Step 3: initialized = False")
             
             # DeepFace models are managed by the library internally
             # Setting to None allows garbage collection
             self.logger.info(f"{self.name} - DeepFace model and embeddings released")
-            print(f"[DEBUG] {self.name} Step 4: Cleanup complete")
         except Exception as e:
-            print(f"[DEBUG] ERROR in {self.name}.cleanup(): {e}")
             self.logger.error(f"Error cleaning up {self.name}: {e}")
-        print(f"[DEBUG] === EXITING {self.name}.cleanup() ===")
@@ -8,6 +8,7 @@ import cv2
 import time
 from .camera_pipeline import CameraPipeline
 from .base_detector import BaseDetector
+from .display import blit_text_sprite
 from .proctor_logger import ProctorLogger
 from .face_detector import FaceDetector
 from .face_matcher import FaceMatcher
@@ -71,7 +72,13 @@ class ProctorPipeline(CameraPipeline):
                     enabled=True,
                     model_selection=getattr(self.config, 'FACE_MODEL_SELECTION', 1),
                     min_detection_confidence=getattr(self.config, 'FACE_MIN_DETECTION_CONFIDENCE', 0.7),
-                    min_tracking_confidence=getattr(self.config, 'FACE_MIN_TRACKING_CONFIDENCE', 0.5)
+                    min_tracking_confidence=getattr(self.config, 'FACE_MIN_TRACKING_CONFIDENCE', 0.5),
+                    max_input_width=getattr(self.config, 'FACE_DETECT_MAX_INPUT_WIDTH', None),
+                    refresh_interval=getattr(self.config, 'FACE_DETECT_REFRESH_INTERVAL', 1),
+                    motion_threshold=getattr(self.config, 'FACE_DETECT_MOTION_THRESHOLD', 4.0),
+                    max_num_faces=getattr(self.config, 'FACE_MAX_NUM_FACES', 5),
+                    use_opencl=getattr(self.config, 'FACE_DETECT_USE_OPENCL', False),
+                    delegate=getattr(self.config, 'FACE_DETECT_DELEGATE', 'CPU')
                 )
                 
                 if self.face_detector.load_model(getattr(self.config, 'FACE_MARKER_MODEL_PATH', None)):
@@ -223,32 +230,46 @@ class ProctorPipeline(CameraPipeline):
         Returns:
             Processed frame with annotations
         """
-        self.proctoring_results["total_frames_captured"] += 1
+        results = self.proctoring_results
+        config = self.config
+        results["total_frames_captured"] += 1
         self.frame_counter += 1
         
         # Check if we should process this frame
         if self.frame_counter <= self.frame_skip:
             # Skip processing, return frame as-is (no overlay if display is disabled)
-            if getattr(self.config, 'DISPLAY_FEED', True):
+            if getattr(config, 'DISPLAY_FEED', True):
                 return self._add_skip_overlay(frame)
             else:
                 return frame
         
         # Reset counter
         self.frame_counter = 0
-        self.proctoring_results["total_frames_processed"] += 1
-        self.session_logger.log_frame_processed()
+        results["total_frames_processed"] += 1
+        
+        # Bind hot attributes to locals once per processed frame
+        alerts = results["alerts"]
+        slog = self.session_logger
+        log = self.logger
+        fd = self.face_detector
+        fm = self.face_matcher
+        ed = self.eye_detector
+        pd = self.phone_detector
+        
+        # Sample the clock once; every alert raised for this frame shares it
+        now = time.time()
+        slog.log_frame_processed()
         
         annotated_frame = frame.copy()
         
         # STEP 1: MediaPipe face detector gets faces
         face_meshes = []
-        if self.face_detector and self.face_detector.enabled:
+        if fd and fd.enabled:
             try:
-                face_meshes = self.face_detector.detect(frame)
+                face_meshes = fd.detect(frame)
             except Exception as e:
-                self.logger.error(f"Error detecting faces: {e}")
-                self.session_logger.log_alert('detection_error', f"Face detection failed: {e}", 'critical')
+                log.error(f"Error detecting faces: {e}")
+                slog.log_alert('detection_error', f"Face detection failed: {e}", 'critical')
         
         num_faces = len(face_meshes)
         verification_result = None
@@ -259,14 +280,14 @@ class ProctorPipeline(CameraPipeline):
             # Multiple faces detected - LOG ALERT
             alert_msg = f"Multiple people detected: {num_faces} faces"
             
-            self.session_logger.log_alert(
+            slog.log_alert(
                 'multiple_faces',
                 alert_msg,
                 'warning',
                 {'num_faces': num_faces}
             )
-            self.proctoring_results["alerts"].append({
-                "timestamp": time.time(),
+            alerts.append({
+                "timestamp": now,
                 "type": "multiple_faces",
                 "message": alert_msg,
                 "severity": "warning"
@@ -275,45 +296,46 @@ class ProctorPipeline(CameraPipeline):
             # No face detected - LOG ALERT
             alert_msg = "No face detected"
             
-            self.session_logger.log_alert(
+            slog.log_alert(
                 'no_face',
                 alert_msg,
                 'warning'
             )
-            self.proctoring_results["alerts"].append({
-                "timestamp": time.time(),
+            alerts.append({
+                "timestamp": now,
                 "type": "no_face",
                 "message": alert_msg,
                 "severity": "warning"
             })
         elif num_faces == 1:
             # STEP 3: If single face then verify
-            if self.face_matcher and self.face_matcher.enabled:
+            if fm and fm.enabled:
                 try:
-                    verification_result = self._verify_face_sequential(frame, face_meshes[0])
+                    verification_result = self._verify_face_sequential(frame, face_meshes.bboxes[0])
                 except Exception as e:
-                    self.logger.error(f"Error during face verification: {e}")
-                    self.session_logger.log_alert('verification_error', f"Verification failed: {e}", 'critical')
+                    log.error(f"Error during face verification: {e}")
+                    slog.log_alert('verification_error', f"Verification failed: {e}", 'critical')
                     verification_result = {'matched': False, 'error': str(e)}
             
             # STEP 4: After verify check eye movement
-            if self.eye_detector and self.eye_detector.enabled:
+            if ed and ed.enabled:
                 try:
                     # Use detect method to get eye data
-                    eye_detections = self.eye_detector.detect(frame, face_meshes)
+                    eye_detections = ed.detect(frame, face_meshes)
                     
                     # Process detections and calculate risk
                     if eye_detections:
+                        calculate_risk = ed.calculate_risk
                         for detection in eye_detections:
                             # Calculate risk for this eye
-                            status, score, h_ratio, v_ratio = self.eye_detector.calculate_risk(detection)
+                            status, score, h_ratio, v_ratio = calculate_risk(detection)
                             
                             # Check for risk alerts
                             if "RISK" in status:
                                 alert_msg = f"Suspicious eye movement detected: {detection.get('eye_name', 'Unknown')} eye - {status}"
-                                self.logger.warning(alert_msg)
-                                self.proctoring_results["alerts"].append({
-                                    "timestamp": time.time(),
+                                log.warning(alert_msg)
+                                alerts.append({
+                                    "timestamp": now,
                                     "type": "eye_movement",
                                     "message": alert_msg,
                                     "severity": "warning"
@@ -322,49 +344,43 @@ class ProctorPipeline(CameraPipeline):
                         # Store detections for drawing
                         eye_result = eye_detections
                 except Exception as e:
-                    self.logger.error(f"Error during eye detection: {e}")
-                    self.session_logger.log_alert('eye_detection_error', f"Eye detection failed: {e}", 'info')
+                    log.error(f"Error during eye detection: {e}")
+                    slog.log_alert('eye_detection_error', f"Eye detection failed: {e}", 'info')
 
             # STEP 5: Check for phone detection
-            if self.phone_detector and self.phone_detector.enabled:
+            if pd and pd.enabled:
                 try:
-                    print(1)
                     # Process frame for phone detection
-                    _, phone_result = self.phone_detector.process_frame(frame, draw=False)
-                    print(2)
+                    _, phone_result = pd.process_frame(frame, draw=False)
                     # Check if phone was detected (alert flag)
                     if phone_result.get('alert', False):
-                        print(3)
                         num_detections = phone_result.get('num_detections', 0)
-                        print(4)
                         alert_msg = f"CHEATING ALERT: Phone detected - potential unauthorized device use ({num_detections} detection(s))"
-                        self.logger.warning(alert_msg)
-                        self.session_logger.log_alert(
+                        log.warning(alert_msg)
+                        slog.log_alert(
                             'cheating_phone_detected',
                             alert_msg,
                             'critical',
                             phone_result
                         )
-                        print(5)
-                        self.proctoring_results["alerts"].append({
-                            "timestamp": time.time(),
+                        alerts.append({
+                            "timestamp": now,
                             "type": "cheating_phone_detected",
                             "message": alert_msg,
                             "severity": "critical"
                         })
-                        print(6)
                 except Exception as e:
-                    self.logger.error(f"Error during phone detection: {e}")
-                    self.session_logger.log_alert('phone_detection_error', f"Phone detection failed: {e}", 'info')
+                    log.error(f"Error during phone detection: {e}")
+                    slog.log_alert('phone_detection_error', f"Phone detection failed: {e}", 'info')
                     
         
         # Only draw annotations if DISPLAY_FEED is enabled
-        if getattr(self.config, 'DISPLAY_FEED', True):
+        if getattr(config, 'DISPLAY_FEED', True):
             # Draw face meshes on frame with configuration
-            if face_meshes and self.face_detector:
-                show_all = getattr(self.config, 'SHOW_ALL_FACE_LANDMARKS', False)
-                show_nums = getattr(self.config, 'SHOW_LANDMARK_NUMBERS', False)
-                annotated_frame = self.face_detector.draw_faces(
+            if face_meshes and fd:
+                show_all = getattr(config, 'SHOW_ALL_FACE_LANDMARKS', False)
+                show_nums = getattr(config, 'SHOW_LANDMARK_NUMBERS', False)
+                annotated_frame = fd.draw_faces(
                     annotated_frame, 
                     face_meshes,
                     show_all_landmarks=show_all,
@@ -372,32 +388,31 @@ class ProctorPipeline(CameraPipeline):
                 )
             
             # Draw eye detection results if available
-            if eye_result and self.eye_detector:
+            if eye_result and ed:
                 try:
                     # Use process_frame to get annotated output
-                    annotated_frame, _ = self.eye_detector.process_frame(annotated_frame, face_meshes, draw=True)
+                    annotated_frame, _ = ed.process_frame(annotated_frame, face_meshes, draw=True, include_ratios=False)
                 except Exception as e:
-                    self.logger.error(f"Error drawing eye keypoints: {e}")
+                    log.error(f"Error drawing eye keypoints: {e}")
             
             # Add verification status overlay (top left)
             annotated_frame = self._add_verification_overlay(annotated_frame, num_faces, verification_result, eye_result)
         
         return annotated_frame
     
-    def _verify_face_sequential(self, frame, face_data):
+    def _verify_face_sequential(self, frame, bbox):
         """
         Sequential face verification (no threading)
         
         Args:
             frame: Input frame
-            face_data: Face mesh data
+            bbox: Face bounding box as an (x, y, w, h) int array (FaceMeshes.bboxes row)
             
         Returns:
             dict: Verification result
         """
         try:
-            bbox = face_data['bbox']
-            x, y, w, h = bbox['x'], bbox['y'], bbox['w'], bbox['h']
+            x, y, w, h = bbox
             
             # Extract face ROI
             face_roi = frame[y:y+h, x:x+w]
@@ -429,7 +444,8 @@ class ProctorPipeline(CameraPipeline):
             cv2.FONT_HERSHEY_SIMPLEX,
             0.6,
             (200, 200, 200),
-            1
+            1,
+            cv2.LINE_8
         )
         return overlay
     
@@ -444,9 +460,11 @@ class ProctorPipeline(CameraPipeline):
             eye_result: Eye detection result (optional)
             
         Returns:
-            Frame with overlay
+            Frame with overlay (drawn in place)
         """
-        overlay = frame.copy()
+        # Only called with process_frame's annotated_frame, which is already a copy
+        overlay = frame
+        draw_text_lines = self._draw_text_lines
         
         # Determine status text and color
         if num_faces > 1:
@@ -468,53 +486,47 @@ class ProctorPipeline(CameraPipeline):
             status_text = "CHECKING..."
             color = (255, 255, 0)  # Yellow
         
-        # Draw background rectangle
+        # Status badge: a filled background box with the status text blitted from its cached sprite
         text_size = cv2.getTextSize(status_text, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)[0]
         cv2.rectangle(overlay, (5, 5), (text_size[0] + 15, 40), (0, 0, 0), -1)
-        
-        # Draw status text
-        cv2.putText(
-            overlay,
-            status_text,
-            (10, 30),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.7,
-            color,
-            2
-        )
+        blit_text_sprite(overlay, ((status_text, 0, 0.7, 2),), color, (10, 30))
         
         # Add eye status if available
         if eye_result and 'eyes' in eye_result:
-            y_offset = 50
+            eye_lines = []
             for eye_data in eye_result['eyes']:
                 eye_status = eye_data.get('risk_status', 'UNKNOWN')
                 eye_color = (0, 255, 0) if eye_status == 'SAFE' else (0, 0, 255) if eye_status == 'RISK' else (255, 165, 0)
-                eye_text = f"{eye_data.get('name', 'Eye')}: {eye_status}"
-                cv2.putText(
-                    overlay,
-                    eye_text,
-                    (10, y_offset),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.5,
-                    eye_color,
-                    1
-                )
-                y_offset += 20
+                eye_lines.append((f"{eye_data.get('name', 'Eye')}: {eye_status}", eye_color))
+            draw_text_lines(overlay, eye_lines, (10, 50), 0.5, 1)
         
         # Add frame counter
-        stats_text = f"Frame: {self.proctoring_results['total_frames_processed']}/{self.proctoring_results['total_frames_captured']}"
-        cv2.putText(
-            overlay,
-            stats_text,
-            (10, frame.shape[0] - 10),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.5,
-            (255, 255, 255),
-            1
-        )
+        results = self.proctoring_results
+        stats_text = f"Frame: {results['total_frames_processed']}/{results['total_frames_captured']}"
+        draw_text_lines(overlay, [(stats_text, (255, 255, 255))], (10, frame.shape[0] - 10), 0.5, 1)
         
         return overlay
     
+    def _draw_text_lines(self, frame, lines, origin, font_scale, thickness, line_height=20):
+        """
+        Draw a block of overlay text lines in place
+        
+        Uses LINE_8 explicitly so overlay text never pays for anti-aliasing.
+        
+        Args:
+            frame: Frame to draw on
+            lines: List of (text, color) tuples, drawn top to bottom
+            origin: (x, y) baseline of the first line
+            font_scale: Font scale
+            thickness: Text thickness
+            line_height: Vertical distance between baselines
+        """
+        x, y = origin
+        for text, color in lines:
+            cv2.putText(frame, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX,
+                        font_scale, color, thickness, cv2.LINE_8)
+            y += line_height
+    
     def _draw_all_detections(self, frame, frame_detections):
         """
         Draw all detection results on the frame
@@ -569,10 +581,11 @@ class ProctorPipeline(CameraPipeline):
         # Example: Alert if multiple faces detected
         if detector_name == "FaceDetector":
             num_faces = detection_results.get("num_faces", 0)
+            now = time.time()
             
             if num_faces > 1:
                 alert = {
-                    "timestamp": time.time(),
+                    "timestamp": now,
                     "detector": detector_name,
                     "type": "multiple_faces",
                     "message": f"Multiple faces detected: {num_faces}",
@@ -582,7 +595,7 @@ class ProctorPipeline(CameraPipeline):
                 self.logger.warning(f"ALERT: {alert['message']}")
             elif num_faces == 0:
                 alert = {
-                    "timestamp": time.time(),
+                    "timestamp": now,
                     "detector": detector_name,
                     "type": "no_face",
                     "message": "No face detected",
@@ -733,18 +746,19 @@ class ProctorPipeline(CameraPipeline):
         # Add FPS if enabled
         if self.config.SHOW_FPS:
             # Calculate FPS (simple moving average)
+            now = time.time()
             if not hasattr(self, '_fps_start_time'):
-                self._fps_start_time = time.time()
+                self._fps_start_time = now
                 self._fps_frame_count = 0
             
             self._fps_frame_count += 1
-            elapsed = time.time() - self._fps_start_time
+            elapsed = now - self._fps_start_time
             
             if elapsed > 1.0:
                 fps = self._fps_frame_count / elapsed
                 self.display.show_frame(frame, fps=fps)
                 self._fps_frame_count = 0
-                self._fps_start_time = time.time()
+                self._fps_start_time = now
             else:
                 self.display.show_frame(frame)
         else:
@@ -752,16 +766,13 @@ class ProctorPipeline(CameraPipeline):
     
     def cleanup(self):
         """Cleanup resources (override from CameraPipeline)"""
-        print("\n[DEBUG] === ENTERING ProctorPipeline.cleanup() ===")
-        print("[DEBUG] Step 0: Starting cleanup")
+        self.logger.debug("Entering ProctorPipeline.cleanup()")
         
         try:
-            print("[DEBUG] Step 1: Generating final report")
             # Generate final report
             self.logger.info("Generating final proctoring report...")
             report = self.get_proctoring_report()
             
-            print("[DEBUG] Step 2: Logging report stats")
             self.logger.info("=" * 60)
             self.logger.info("PROCTORING SESSION REPORT")
             self.logger.info("=" * 60)
@@ -776,66 +787,48 @@ class ProctorPipeline(CameraPipeline):
                     self.logger.info(f"  - {alert_type}: {count}")
             
             self.logger.info("=" * 60)
-            print("[DEBUG] Step 3: Report generation complete")
         except Exception as e:
-            print(f"[DEBUG] ERROR in report generation: {e}")
             self.logger.error(f"Error generating final report: {e}")
         
         # Close session logger and save
         try:
-            print("[DEBUG] Step 4: Checking session logger")
             if hasattr(self, 'session_logger') and self.session_logger:
-                print("[DEBUG] Step 5: Getting session summary")
                 summary = self.session_logger.get_session_summary()
                 self.logger.info(f"Session logs saved to: {summary['log_file']}")
                 self.logger.info(f"Session alerts saved to: {summary['alerts_file']}")
-                print("[DEBUG] Step 6: Closing session logger")
                 self.session_logger.close()
-                print("[DEBUG] Step 7: Session logger closed")
+                self.logger.debug("Session logger closed")
         except Exception as e:
-            print(f"[DEBUG] ERROR closing session logger: {e}")
             self.logger.error(f"Error closing session logger: {e}")
         
         # Cleanup all registered detectors
         try:
-            print("[DEBUG] Step 8: Checking detectors")
             if hasattr(self, 'detectors') and self.detectors:
-                print(f"[DEBUG] Step 9: Found {len(self.detectors)} detectors to clean")
                 self.logger.info("Cleaning up registered detectors...")
+                start_time = time.perf_counter()
                 # Create a list copy to avoid modifying dict during iteration
                 detector_items = list(self.detectors.items())
-                print(f"[DEBUG] Step 10: Created detector list copy with {len(detector_items)} items")
                 
-                for idx, (detector_name, detector) in enumerate(detector_items):
+                for detector_name, detector in detector_items:
                     try:
-                        print(f"[DEBUG] Step 11.{idx}: Cleaning detector '{detector_name}'")
                         if hasattr(detector, 'cleanup') and callable(detector.cleanup):
                             self.logger.info(f"Cleaning up {detector_name}...")
-                            print(f"[DEBUG] Step 12.{idx}: Calling cleanup() on '{detector_name}'")
                             detector.cleanup()
-                            print(f"[DEBUG] Step 13.{idx}: Cleanup completed for '{detector_name}'")
                         else:
-                            print(f"[DEBUG] Step 12.{idx}: No cleanup method for '{detector_name}'")
                             self.logger.warning(f"{detector_name} has no cleanup method")
                     except Exception as e:
-                        print(f"[DEBUG] ERROR cleaning up {detector_name}: {e}")
                         self.logger.error(f"Error cleaning up {detector_name}: {e}", exc_info=True)
                 
-                print("[DEBUG] Step 14: Clearing detectors dict")
                 self.detectors.clear()
-                print("[DEBUG] Step 15: Detectors cleared")
+                self.logger.debug("Cleaned %d detectors in %.3fs", len(detector_items), time.perf_counter() - start_time)
                 self.logger.info("All detectors cleaned up")
         except Exception as e:
-            print(f"[DEBUG] ERROR during detector cleanup: {e}")
             self.logger.error(f"Error during detector cleanup: {e}", exc_info=True)
         
         # Call parent cleanup (camera and display)
         try:
-            print("[DEBUG] Step 16: Calling parent (CameraPipeline) cleanup")
             super().cleanup()
-            print("[DEBUG] Step 17: Parent cleanup returned")
         except Exception as e:
-            print(f"[DEBUG] ERROR in parent cleanup: {e}")
             self.logger.error(f"Error in parent cleanup: {e}", exc_info=True)
         
-        print("[DEBUG] === EXITING ProctorPipeline.cleanup() ===")
+        self.logger.debug("Exiting ProctorPipeline.cleanup()")
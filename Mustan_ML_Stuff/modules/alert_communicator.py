@@ -4,10 +4,32 @@ Manages alert state communication between Python CV process and Electron fronten
 """
 
 import json
+import mmap
 import os
 import time
 import logging
 
+NUM_ALERTS = 5
+
+# Fixed alert file size; the longest payload is 15 bytes, shorter ones are space padded
+ALERT_FILE_SIZE = 16
+
+# Per-alert flags and active alert indices for every alert state bitmask (shared, immutable)
+STATE_TUPLES = tuple(
+    tuple((mask >> i) & 1 for i in range(NUM_ALERTS))
+    for mask in range(1 << NUM_ALERTS)
+)
+ACTIVE_ALERTS = tuple(
+    tuple(i for i in range(NUM_ALERTS) if (mask >> i) & 1)
+    for mask in range(1 << NUM_ALERTS)
+)
+
+# File contents for every alert state bitmask (bit i = alert i), e.g. b"[1, 0, 0, 0, 0] " for 0b00001
+STATE_PAYLOADS = tuple(
+    json.dumps([(mask >> i) & 1 for i in range(NUM_ALERTS)]).encode('ascii').ljust(ALERT_FILE_SIZE)
+    for mask in range(1 << NUM_ALERTS)
+)
+
 
 class AlertCommunicator:
     """
@@ -21,6 +43,19 @@ class AlertCommunicator:
     ALERT_MULTI_FACE = 2
     ALERT_FACE_MISMATCH = 3
     ALERT_EYE_MOVEMENT = 4
+    NUM_ALERTS = NUM_ALERTS
+    
+    # Keyword names accepted by update()
+    ALERT_KEYS = {
+        'phone': ALERT_PHONE,
+        'no_face': ALERT_NO_FACE,
+        'multi_face': ALERT_MULTI_FACE,
+        'face_mismatch': ALERT_FACE_MISMATCH,
+        'eye_movement': ALERT_EYE_MOVEMENT
+    }
+    
+    # Critical alerts that activate without waiting for the cooldown
+    FORCED_ALERTS_MASK = 1 << ALERT_PHONE
     
     def __init__(self, log_dir='logs/proctoring', alert_file_name='alert_state.txt', 
                  write_interval=0.1, cooldown_duration=1.0):
@@ -38,9 +73,9 @@ class AlertCommunicator:
         os.makedirs(self.log_dir, exist_ok=True)
         self.alert_file = os.path.join(self.log_dir, alert_file_name)
         
-        # Alert state: [phone, no_face, multi_face, face_mismatch, eye_movement]
-        self.alert_state = [0, 0, 0, 0, 0]
-        self.last_state = [0, 0, 0, 0, 0]
+        # Alert state bitmask, bit i = alert i: [phone, no_face, multi_face, face_mismatch, eye_movement]
+        self.alert_state = 0
+        self.last_state = 0
         
         # Write management
         self.last_write_time = 0
@@ -48,13 +83,16 @@ class AlertCommunicator:
         self.pending_write = False
         
         # Cooldown management (prevents rapid toggling)
-        self.alert_cooldowns = [0.0] * 5  # Timestamp of last activation
+        self.alert_cooldowns = [0.0] * self.NUM_ALERTS  # Timestamp of last activation
         self.cooldown_duration = cooldown_duration
         
         self.logger = logging.getLogger(self.__class__.__name__)
         
+        # Map the fixed-size state file once; updates then overwrite it in place
+        self._mm = self._map_alert_file()
+        
         # Initialize file with all zeros
-        self._write_state()
+        self._write_state(force=True)
         self.logger.info(f"Alert state file: {self.alert_file}")
     
     def set_alert(self, index, value, force=False):
@@ -69,7 +107,7 @@ class AlertCommunicator:
         Returns:
             bool: True if state was updated, False if blocked by cooldown
         """
-        if index < 0 or index >= len(self.alert_state):
+        if index < 0 or index >= self.NUM_ALERTS:
             self.logger.warning(f"Invalid alert index: {index}")
             return False
         
@@ -86,22 +124,78 @@ class AlertCommunicator:
                 return False
         
         # Update state if changed
-        if self.alert_state[index] != value:
-            old_value = self.alert_state[index]
-            self.alert_state[index] = value
-            self.pending_write = True
+        mask = 1 << index
+        new_state = (self.alert_state | mask) if value else (self.alert_state & ~mask)
+        if new_state != self.alert_state:
+            old_value = 1 - value
+            self.alert_state = new_state
+            # A toggle back to the last written value needs no write of its own
+            if (new_state ^ self.last_state) & mask:
+                self.pending_write = True
             
             # Update cooldown timestamp on activation
             if value == 1:
                 self.alert_cooldowns[index] = current_time
-                self.logger.debug(f"Alert {index} activated (was {old_value})")
+                self.logger.debug("Alert %d activated (was %d)", index, old_value)
             else:
-                self.logger.debug(f"Alert {index} cleared (was {old_value})")
+                self.logger.debug("Alert %d cleared (was %d)", index, old_value)
             
             return True
         
         return False
     
+    def update(self, **alerts):
+        """
+        Set several alerts in one state update (one cooldown pass, one clock read)
+        
+        Args:
+            **alerts: Alert values by name: phone, no_face, multi_face, face_mismatch, eye_movement.
+                      Activations are subject to the cooldown, except for the phone alert.
+        
+        Returns:
+            bool: True if the state changed
+        """
+        set_mask = 0
+        clear_mask = 0
+        for name, value in alerts.items():
+            index = self.ALERT_KEYS.get(name)
+            if index is None:
+                self.logger.warning(f"Invalid alert name: {name}")
+                continue
+            if value:
+                set_mask |= 1 << index
+            else:
+                clear_mask |= 1 << index
+        
+        # Newly activated alerts: drop those still in cooldown, stamp the rest
+        activating = set_mask & ~self.alert_state
+        if activating:
+            current_time = time.time()
+            for index in range(self.NUM_ALERTS):
+                bit = 1 << index
+                if not activating & bit:
+                    continue
+                if (not bit & self.FORCED_ALERTS_MASK
+                        and current_time - self.alert_cooldowns[index] < self.cooldown_duration):
+                    activating &= ~bit
+                else:
+                    self.alert_cooldowns[index] = current_time
+        
+        new_state = (self.alert_state & ~clear_mask) | activating
+        if new_state == self.alert_state:
+            return False
+        
+        changed = new_state ^ self.alert_state
+        self.alert_state = new_state
+        # Only changes against the last written state need a write
+        if changed & (new_state ^ self.last_state):
+            self.pending_write = True
+        
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Alerts updated: %s", self.get_current_state())
+        
+        return True
+    
     def set_phone_detected(self, detected):
         """Set phone detection alert"""
         return self.set_alert(self.ALERT_PHONE, detected, force=True)  # Critical, bypass cooldown
@@ -124,22 +218,25 @@ class AlertCommunicator:
     
     def clear_alert(self, index):
         """Clear specific alert (bypass cooldown for clearing)"""
-        if index < 0 or index >= len(self.alert_state):
+        if index < 0 or index >= self.NUM_ALERTS:
             return False
         
-        if self.alert_state[index] == 1:
-            self.alert_state[index] = 0
-            self.pending_write = True
-            self.logger.debug(f"Alert {index} manually cleared")
+        mask = 1 << index
+        if self.alert_state & mask:
+            self.alert_state &= ~mask
+            if self.last_state & mask:
+                self.pending_write = True
+            self.logger.debug("Alert %d manually cleared", index)
             return True
         
         return False
     
     def clear_all_alerts(self):
         """Clear all alerts"""
-        if any(self.alert_state):
-            self.alert_state = [0, 0, 0, 0, 0]
-            self.pending_write = True
+        if self.alert_state:
+            self.alert_state = 0
+            if self.last_state:
+                self.pending_write = True
             self.logger.debug("All alerts cleared")
             return True
         return False
@@ -168,51 +265,103 @@ class AlertCommunicator:
     
     def force_write(self):
         """
-        Force immediate write regardless of interval.
+        Force immediate, durable write regardless of interval.
         Use for session end or critical updates.
         """
-        self._write_state()
+        self._write_state(force=True, durable=True)
         self.pending_write = False
         self.last_write_time = time.time()
     
-    def _write_state(self):
+    def _map_alert_file(self):
         """
-        Perform atomic write to alert state file.
-        Uses temp file + rename for atomicity.
+        Create the alert state file at its fixed size and memory-map it
+        
+        Returns:
+            mmap.mmap or None: Writable mapping of the file, None to fall back to temp file + rename
         """
         try:
-            # Write to temporary file first
-            temp_file = self.alert_file + '.tmp'
-            with open(temp_file, 'w') as f:
-                json.dump(self.alert_state, f)
-            
-            # Atomic rename (prevents partial reads)
-            os.replace(temp_file, self.alert_file)
+            fd = os.open(self.alert_file, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                os.ftruncate(fd, ALERT_FILE_SIZE)
+                return mmap.mmap(fd, ALERT_FILE_SIZE)
+            finally:
+                # The mapping keeps its own reference to the file
+                os.close(fd)
+        except Exception as e:
+            self.logger.warning(f"Could not memory-map alert state file, using atomic rename: {e}")
+            return None
+    
+    def _write_state(self, force=False, durable=False):
+        """
+        Write the alert state file.
+        Overwrites the mapped fixed-size file in place (a single 16-byte copy that
+        readers never see torn); falls back to temp file + rename without a mapping.
+        
+        Args:
+            force: Write even if the state matches the last written state
+            durable: Also flush the state to disk (the frontend poller reads the page
+                     cache, so this is only needed at session end)
+        """
+        # The file already holds this state (e.g. an alert flipped on and off within one interval)
+        if not force and self.alert_state == self.last_state:
+            return
+        
+        try:
+            payload = STATE_PAYLOADS[self.alert_state]
+            if self._mm is not None:
+                self._mm[:] = payload
+                if durable:
+                    self._mm.flush()
+            else:
+                # Write to temporary file first (single write syscall of the precomputed payload)
+                temp_file = self.alert_file + '.tmp'
+                fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    os.write(fd, payload)
+                    if durable:
+                        os.fsync(fd)
+                finally:
+                    os.close(fd)
+                
+                # Atomic rename (prevents partial reads)
+                os.replace(temp_file, self.alert_file)
+                if durable:
+                    self._fsync_log_dir()
             
             # Log state changes
             if self.alert_state != self.last_state:
-                self.logger.info(f"Alert state updated: {self.alert_state}")
-                self.last_state = self.alert_state.copy()
+                self.logger.info(f"Alert state updated: {self.get_current_state()}")
+                self.last_state = self.alert_state
         
         except Exception as e:
             self.logger.error(f"Error writing alert state: {e}")
     
+    def _fsync_log_dir(self):
+        """Persist the rename of the alert file (directory fsync, POSIX only)"""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        dir_fd = os.open(self.log_dir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    
     def get_current_state(self):
-        """Get current alert state as list"""
-        return self.alert_state.copy()
+        """Get current alert state as a tuple of 0/1 flags (shared table entry, no allocation)"""
+        return STATE_TUPLES[self.alert_state]
     
     def get_active_alerts(self):
         """
         Get list of currently active alert indices
         
         Returns:
-            list: Indices of alerts that are active (value = 1)
+            tuple: Indices of alerts that are active (value = 1)
         """
-        return [i for i, val in enumerate(self.alert_state) if val == 1]
+        return ACTIVE_ALERTS[self.alert_state]
     
     def has_any_alerts(self):
         """Check if any alerts are active"""
-        return any(self.alert_state)
+        return self.alert_state != 0
     
     def get_alert_name(self, index):
         """Get human-readable name for alert index"""
@@ -225,10 +374,17 @@ class AlertCommunicator:
         }
         return names.get(index, f"Unknown Alert {index}")
     
+    def close(self):
+        """Write any pending state and release the file mapping"""
+        if self.pending_write:
+            self.force_write()
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+    
     def __del__(self):
         """Ensure final state is written on cleanup"""
         try:
-            if self.pending_write:
-                self.force_write()
+            self.close()
         except:
             pass
@@ -5,12 +5,22 @@ Handles camera capture and frame retrieval
 
 import cv2
 import logging
+import sys
+import time
+
+# Capture API per platform for backend="auto", so OpenCV does not probe every compiled-in backend
+PLATFORM_BACKENDS = {
+    'linux': 'V4L2',
+    'win32': 'DSHOW',
+    'darwin': 'AVFOUNDATION'
+}
 
 
 class CameraCapture:
     """Handles camera input and frame capture"""
     
-    def __init__(self, camera_id=0, width=None, height=None, fps=None):
+    def __init__(self, camera_id=0, width=None, height=None, fps=None, fourcc=None, buffer_size=None,
+                 backend=None):
         """
         Initialize camera capture
         
@@ -19,25 +29,65 @@ class CameraCapture:
             width: Frame width (optional)
             height: Frame height (optional)
             fps: Frames per second (optional)
+            fourcc: Four-character pixel format to request, e.g. "MJPG" (optional)
+            buffer_size: Number of frames the driver may queue (optional)
+            backend: Capture API name, e.g. "V4L2" or "DSHOW"; "auto" picks the platform
+                     default, None or "ANY" lets OpenCV probe (optional)
         """
         self.camera_id = camera_id
         self.capture = None
         self.width = width
         self.height = height
         self.fps = fps
+        self.fourcc = fourcc
+        self.buffer_size = buffer_size
+        self.backend = backend
         self.is_opened = False
+        self.dropped_frames = 0  # Stale frames skipped by read_latest_frame()
+        self._last_grab_time = None  # When the caller last took a frame, for read_latest_frame()
         
         logging.info(f"Initializing camera with ID: {camera_id}")
         
+    def _resolve_backend(self):
+        """
+        Map the configured backend name to an OpenCV capture API constant
+        
+        Returns:
+            int: cv2.CAP_* constant (cv2.CAP_ANY when unset or unknown)
+        """
+        name = self.backend
+        if name and name.lower() == 'auto':
+            name = PLATFORM_BACKENDS.get(sys.platform)
+        if not name:
+            return cv2.CAP_ANY
+        
+        api = getattr(cv2, f"CAP_{name.upper()}", None)
+        if api is None:
+            logging.warning(f"Unknown camera backend '{name}', letting OpenCV choose")
+            return cv2.CAP_ANY
+        return api
+    
     def start(self):
         """Start camera capture"""
         try:
-            self.capture = cv2.VideoCapture(self.camera_id)
+            api = self._resolve_backend()
+            self.capture = cv2.VideoCapture(self.camera_id, api)
+            
+            # The explicit backend may not be built in or may not support this device
+            if not self.capture.isOpened() and api != cv2.CAP_ANY:
+                logging.warning(f"Camera {self.camera_id} did not open with backend '{self.backend}', retrying with autodetection")
+                self.capture.release()
+                self.capture = cv2.VideoCapture(self.camera_id)
             
             if not self.capture.isOpened():
                 raise RuntimeError(f"Failed to open camera {self.camera_id}")
             
             # Set camera properties if specified
+            # Pixel format first: the format decides which resolutions/frame rates are offered
+            if self.fourcc:
+                self.capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+            if self.buffer_size:
+                self.capture.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
             if self.width:
                 self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
             if self.height:
@@ -78,23 +128,89 @@ class CameraCapture:
         
         return success, frame
     
+    def grab_frame(self):
+        """
+        Advance the camera by one frame without decoding it
+        
+        Returns:
+            bool: True if a frame was grabbed
+        """
+        if not self.is_opened or self.capture is None:
+            logging.warning("Camera is not opened")
+            return False
+        
+        if not self.capture.grab():
+            logging.warning("Failed to grab frame from camera")
+            return False
+        
+        self._last_grab_time = time.perf_counter()
+        return True
+    
+    def read_latest_frame(self, max_drain=5):
+        """
+        Read the newest available frame, skipping frames that queued up in the
+        driver buffer while the caller was busy processing
+        
+        The whole frame periods elapsed since the caller last took a frame bound
+        how many frames can have queued up; all but the newest of those are
+        skipped. Draining also stops at the first grab() that has to wait for
+        the camera, since a buffered frame returns in under half a frame period.
+        When the caller finishes within two frame periods, this is a plain
+        grab + retrieve and nothing is dropped.
+        
+        Args:
+            max_drain: Maximum number of stale frames to skip per call
+            
+        Returns:
+            tuple: (success, frame) where success is a boolean and frame is the image
+        """
+        if not self.is_opened or self.capture is None:
+            logging.warning("Camera is not opened")
+            return False, None
+        
+        frame_period = 1.0 / (self.fps or 30)
+        
+        # Frames the camera delivered since the caller last took one; only an overrun can leave a backlog
+        grab_start = time.perf_counter()
+        backlog = 0
+        if self._last_grab_time is not None:
+            backlog = int((grab_start - self._last_grab_time) / frame_period)
+        
+        if not self.capture.grab():
+            logging.warning("Failed to read frame from camera")
+            return False, None
+        
+        # A buffered frame is returned in well under half a frame period
+        stale_threshold = 0.5 * frame_period
+        if backlog > 1 and time.perf_counter() - grab_start < stale_threshold:
+            dropped = 0
+            while dropped < min(backlog - 1, max_drain):
+                grab_start = time.perf_counter()
+                if not self.capture.grab():
+                    break
+                dropped += 1
+                if time.perf_counter() - grab_start >= stale_threshold:
+                    break
+            self.dropped_frames += dropped
+        
+        self._last_grab_time = time.perf_counter()
+        success, frame = self.capture.retrieve()
+        
+        if not success:
+            logging.warning("Failed to read frame from camera")
+        
+        return success, frame
+    
     def stop(self):
         """Stop camera capture and release resources"""
-        print("[DEBUG] === ENTERING Camera.stop() ===")
         try:
-            print("[DEBUG] Camera Step 0: Checking capture object")
             if self.capture is not None:
-                print("[DEBUG] Camera Step 1: Calling capture.release()")
                 self.capture.release()
-                print("[DEBUG] Camera Step 2: Capture released")
                 self.is_opened = False
                 logging.info("Camera stopped and resources released")
-                print("[DEBUG] Camera Step 3: Cleanup complete")
         except Exception as e:
-            print(f"[DEBUG] ERROR in Camera.stop(): {e}")
             logging.error(f"Error stopping camera: {e}")
             self.is_opened = False
-        print("[DEBUG] === EXITING Camera.stop() ===")
     
     def get_properties(self):
         """Get current camera properties"""
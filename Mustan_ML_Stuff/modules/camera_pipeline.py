@@ -7,6 +7,9 @@ YOLOv8 Face Detection Pipeline
 """
 import cv2
 import logging
+import queue
+import sys
+import threading
 import time
 from .camera_input import CameraCapture
 from .display import DisplayWindow
@@ -27,6 +30,22 @@ class CameraPipeline:
         self.display = None
         self.is_running = False
         
+        # Frame skipping: process one frame, then skip FRAME_SKIP frames
+        self.frame_skip = getattr(self.config, 'FRAME_SKIP', 0)
+        self.frame_counter = 0
+        self._last_processed = None
+        
+        # Background capture (THREADED_CAPTURE): reader thread -> single latest-frame slot
+        self._latest_frame = None
+        self._frame_lock = threading.Lock()
+        self._frame_ready = None
+        self._capture_thread = None
+        
+        # Background display (THREADED_DISPLAY): GUI thread owning the window <- 1-slot frame queue
+        self._threaded_display = False
+        self._display_queue = None
+        self._display_thread = None
+        
         # Setup logging
         self._setup_logging()
         
@@ -47,7 +66,10 @@ class CameraPipeline:
             camera_id=self.config.CAMERA_ID,
             width=self.config.CAMERA_WIDTH,
             height=self.config.CAMERA_HEIGHT,
-            fps=self.config.CAMERA_FPS
+            fps=self.config.CAMERA_FPS,
+            fourcc=getattr(self.config, 'CAMERA_FOURCC', None),
+            buffer_size=getattr(self.config, 'CAMERA_BUFFER_SIZE', None),
+            backend=getattr(self.config, 'CAMERA_BACKEND', None)
         )
         
         if not self.camera.start():
@@ -61,7 +83,14 @@ class CameraPipeline:
                 fullscreen=self.config.FULLSCREEN
             )
             
-            if not self.display.create_window():
+            # HighGUI windows must live on the main thread on macOS
+            self._threaded_display = getattr(self.config, 'THREADED_DISPLAY', False)
+            if self._threaded_display and sys.platform == 'darwin':
+                logging.info("THREADED_DISPLAY is not supported on macOS, showing frames on the main thread")
+                self._threaded_display = False
+            
+            # With a GUI thread, the window is created by (and belongs to) that thread
+            if not self._threaded_display and not self.display.create_window():
                 logging.error("Failed to create display window")
                 self.camera.stop()
                 return False
@@ -85,6 +114,144 @@ class CameraPipeline:
         # Default: no processing, just return the frame
         return frame
     
+    def process_skipped_frame(self, frame):
+        """
+        Produce the output for a frame skipped by FRAME_SKIP (override for custom handling)
+        
+        Args:
+            frame: Input frame from camera
+            
+        Returns:
+            Frame to display: the last processed frame, or the input until one exists
+        """
+        return self._last_processed if self._last_processed is not None else frame
+    
+    def needs_frame(self):
+        """
+        Whether the next camera frame has to be decoded: always when the feed is
+        displayed, otherwise only when it will be processed
+        
+        Returns:
+            bool: True to read the next frame, False to only grab it
+        """
+        return self.display is not None or self.frame_counter >= self.frame_skip
+    
+    def skip_frame(self):
+        """
+        Called for a frame that was grabbed but not decoded because needs_frame()
+        returned False (override to keep additional counters in step)
+        """
+        self.frame_counter += 1
+    
+    def _start_capture_thread(self):
+        """Start the background thread that publishes camera frames into a single latest-frame slot"""
+        self._latest_frame = None
+        self._frame_ready = threading.Event()
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop,
+            name="CameraCaptureThread",
+            daemon=True
+        )
+        self._capture_thread.start()
+        logging.info("Camera capture running on a background thread")
+    
+    def _capture_loop(self):
+        """Reader thread: decode frames while the main thread processes the previous one"""
+        read_frame = self.camera.read_frame
+        
+        while self.is_running:
+            success, frame = read_frame()
+            if not success:
+                time.sleep(0.005)
+                continue
+            
+            # Overwrite the slot; an unconsumed frame is stale once a newer one exists
+            with self._frame_lock:
+                if self._latest_frame is not None:
+                    self.camera.dropped_frames += 1
+                self._latest_frame = frame
+                self._frame_ready.set()
+        
+        # Wake the consumer so it notices the shutdown
+        self._frame_ready.set()
+    
+    def _read_captured_frame(self):
+        """
+        Take the latest frame published by the capture thread, blocking until one is available
+        
+        Returns:
+            tuple: (success, frame), (False, None) on timeout or shutdown
+        """
+        if not self._frame_ready.wait(timeout=1.0):
+            return False, None
+        
+        with self._frame_lock:
+            frame = self._latest_frame
+            self._latest_frame = None
+            self._frame_ready.clear()
+        
+        if frame is None:
+            return False, None
+        
+        return True, frame
+    
+    def _stop_capture_thread(self):
+        """Wait for the capture thread to exit so the camera can be released safely"""
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=2.0)
+            if self._capture_thread.is_alive():
+                logging.warning("Camera capture thread did not stop in time")
+            self._capture_thread = None
+    
+    def _start_display_thread(self):
+        """Start the GUI thread that owns the display window and shows processed frames"""
+        self._display_queue = queue.Queue(maxsize=1)
+        self._display_thread = threading.Thread(
+            target=self._display_loop,
+            name="DisplayThread",
+            daemon=True
+        )
+        self._display_thread.start()
+        logging.info("Display running on a background GUI thread")
+    
+    def _display_loop(self):
+        """GUI thread: create the window, show queued frames and watch for the exit key"""
+        display = self.display
+        if not display.create_window():
+            logging.error("Failed to create display window")
+            self.is_running = False
+            return
+        
+        display_queue = self._display_queue
+        while self.is_running:
+            try:
+                frame, fps = display_queue.get(timeout=0.1)
+                display.show_frame(frame, fps=fps)
+            except queue.Empty:
+                pass
+            
+            # Keep pumping GUI events while idle so the window stays responsive
+            if display.check_exit_key(1):
+                logging.info("Exit key pressed")
+                self.is_running = False
+        
+        display.destroy_all()
+    
+    def _queue_display_frame(self, frame, fps=None):
+        """Hand a frame to the GUI thread, dropping it if the previous one is still pending"""
+        try:
+            self._display_queue.put_nowait((frame, fps))
+        except queue.Full:
+            pass
+    
+    def _stop_display_thread(self):
+        """Wait for the GUI thread to close its window"""
+        if self._display_thread is not None:
+            self._display_thread.join(timeout=2.0)
+            if self._display_thread.is_alive():
+                logging.warning("Display thread did not stop in time")
+            self._display_thread = None
+    
     def run(self):
         """Main pipeline loop"""
         if not self.initialize():
@@ -97,53 +264,112 @@ class CameraPipeline:
         # FPS tracking
         fps = 0
         frame_count = 0
-        start_time = time.time()
-        frame_time = 1.0 / self.config.MAX_FPS if self.config.MAX_FPS > 0 else 0
+        start_ns = time.perf_counter_ns()
+        frame_ns = int(10**9 // self.config.MAX_FPS) if self.config.MAX_FPS > 0 else 0
+        
+        # Threaded capture overlaps decode with processing; otherwise skip-to-latest
+        # keeps end-to-end latency at ~1 frame when processing lags
+        threaded_capture = getattr(self.config, 'THREADED_CAPTURE', False)
+        if threaded_capture:
+            self._start_capture_thread()
+            read_frame = self._read_captured_frame
+        elif getattr(self.config, 'DROP_STALE_FRAMES', False):
+            read_frame = self.camera.read_latest_frame
+        else:
+            read_frame = self.camera.read_frame
+        reported_dropped = 0
+        
+        # A GUI thread takes imshow/waitKey off this loop; frames reach it through a 1-slot queue
+        threaded_display = self.display is not None and self._threaded_display
+        if threaded_display:
+            self._start_display_thread()
+        
+        # Bind everything the loop touches per frame to locals once
+        display = self.display if not threaded_display else None
+        show_fps = self.config.SHOW_FPS
+        show_frame = display.show_frame if display else None
+        check_exit_key = display.check_exit_key if display else None
+        queue_display_frame = self._queue_display_frame if threaded_display else None
+        process_frame = self.process_frame
+        process_skipped_frame = self.process_skipped_frame
+        needs_frame = self.needs_frame
+        skip_frame = self.skip_frame
+        grab_frame = self.camera.grab_frame
+        frame_skip = self.frame_skip
+        perf_counter_ns = time.perf_counter_ns
+        sleep = time.sleep
         
         try:
             while self.is_running:
-                loop_start = time.time()
+                loop_start_ns = perf_counter_ns()
+                deadline_ns = loop_start_ns + frame_ns
+                
+                # Frames the pipeline will discard are only grabbed, never decoded
+                if not threaded_capture and not needs_frame():
+                    if grab_frame():
+                        skip_frame()
+                    else:
+                        # Back off instead of spinning while the camera is gone
+                        sleep(0.005)
+                    continue
                 
                 # Read frame from camera
-                success, frame = self.camera.read_frame()
+                success, frame = read_frame()
                 
                 if not success:
-                    logging.warning("Failed to read frame, continuing...")
+                    if self.is_running:
+                        logging.warning("Failed to read frame, continuing...")
                     continue
                 
-                # Process frame (can be overridden)
-                processed_frame = self.process_frame(frame)
+                # Process frame (can be overridden), honoring FRAME_SKIP
+                self.frame_counter += 1
+                reused_frame = False
+                if self.frame_counter <= frame_skip:
+                    processed_frame = process_skipped_frame(frame)
+                    reused_frame = processed_frame is self._last_processed
+                else:
+                    self.frame_counter = 0
+                    processed_frame = process_frame(frame)
+                    self._last_processed = processed_frame
                 
                 # Display frame only if DISPLAY_FEED is enabled
-                if self.display:
-                    if self.config.SHOW_FPS:
-                        self.display.show_frame(processed_frame, fps=fps)
+                if display:
+                    # A re-shown frame already carries FPS text drawn in place when it was first shown
+                    if show_fps and not reused_frame:
+                        show_frame(processed_frame, fps=fps)
                     else:
-                        self.display.show_frame(processed_frame)
+                        show_frame(processed_frame)
                     
-                    # Check for exit key
-                    if self.display.check_exit_key(1):
+                    # waitKey both pumps the GUI and absorbs the frame-rate slack
+                    wait_ms = 1
+                    if frame_ns > 0:
+                        wait_ms = max(1, (deadline_ns - perf_counter_ns()) // 1_000_000)
+                    if check_exit_key(wait_ms):
                         logging.info("Exit key pressed")
                         break
                 else:
-                    # In background mode, check for keyboard interrupt or use time-based exit
-                    # Small delay to prevent CPU spinning
-                    time.sleep(0.001)
+                    if queue_display_frame is not None:
+                        queue_display_frame(processed_frame, fps if show_fps and not reused_frame else None)
+                    
+                    # In background mode (or with a GUI thread) there is no waitKey here to pace on;
+                    # sleep until the deadline. Frame reads block, so there is no spin to guard against.
+                    sleep_ns = deadline_ns - perf_counter_ns()
+                    if frame_ns > 0 and sleep_ns > 0:
+                        sleep(sleep_ns / 1e9)
                 
-                # Calculate FPS
+                # Calculate FPS (monotonic integer nanoseconds)
                 frame_count += 1
-                elapsed = time.time() - start_time
-                if elapsed > 1.0:
-                    fps = frame_count / elapsed
+                end_ns = perf_counter_ns()
+                elapsed_ns = end_ns - start_ns
+                if elapsed_ns > 1_000_000_000:
+                    fps = frame_count * 1e9 / elapsed_ns
                     frame_count = 0
-                    start_time = time.time()
-                
-                # Frame rate limiting
-                if frame_time > 0:
-                    processing_time = time.time() - loop_start
-                    sleep_time = frame_time - processing_time
-                    if sleep_time > 0:
-                        time.sleep(sleep_time)
+                    start_ns = end_ns
+                    
+                    dropped = self.camera.dropped_frames
+                    if dropped > reported_dropped:
+                        logging.debug(f"Dropped {dropped - reported_dropped} stale frame(s) in the last {elapsed_ns / 1e9:.1f}s ({dropped} total)")
+                        reported_dropped = dropped
         
         except KeyboardInterrupt:
             logging.info("Pipeline interrupted by user")
@@ -156,31 +382,22 @@ class CameraPipeline:
     
     def cleanup(self):
         """Cleanup resources"""
-        print("\n[DEBUG] === ENTERING CameraPipeline.cleanup() ===")
-        print("[DEBUG] CameraPipeline Step 0: Starting cleanup")
         logging.info("Cleaning up pipeline resources...")
         self.is_running = False
+        self._stop_capture_thread()
+        self._stop_display_thread()
         
         try:
-            print("[DEBUG] CameraPipeline Step 1: Checking camera")
             if self.camera:
-                print("[DEBUG] CameraPipeline Step 2: Stopping camera")
                 self.camera.stop()
-                print("[DEBUG] CameraPipeline Step 3: Camera stopped")
         except Exception as e:
-            print(f"[DEBUG] ERROR stopping camera: {e}")
             logging.error(f"Error stopping camera: {e}")
         
         try:
-            print("[DEBUG] CameraPipeline Step 4: Checking display")
-            if self.display:
-                print("[DEBUG] CameraPipeline Step 5: Destroying display")
+            # A GUI thread destroys its own window on exit
+            if self.display and not self._threaded_display:
                 self.display.destroy_all()
-                print("[DEBUG] CameraPipeline Step 6: Display destroyed")
         except Exception as e:
-            print(f"[DEBUG] ERROR destroying display: {e}")
             logging.error(f"Error destroying display: {e}")
         
-        print("[DEBUG] CameraPipeline Step 7: Cleanup complete")
-        logging.info("Pipeline cleanup complete")
-        print("[DEBUG] === EXITING CameraPipeline.cleanup() ===")
\ No newline at end of file
+        logging.info("Pipeline cleanup complete")
\ No newline at end of file
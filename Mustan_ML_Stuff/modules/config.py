@@ -3,6 +3,8 @@ Configuration Module
 Central configuration for camera pipeline and proctoring system
 """
 
+from collections import namedtuple
+
 
 class ProctorConfig:
     """Pipeline configuration settings"""
@@ -12,6 +14,9 @@ class ProctorConfig:
     CAMERA_WIDTH = 1080
     CAMERA_HEIGHT = 720
     CAMERA_FPS = 30
+    CAMERA_FOURCC = "MJPG"  # Compressed USB stream; uncompressed YUYV cannot sustain this resolution at 30 FPS (None = driver default)
+    CAMERA_BUFFER_SIZE = 1  # Frames queued by the driver; 1 keeps capture latency to a single frame
+    CAMERA_BACKEND = "auto"  # Capture API: "auto" (V4L2 on Linux, DSHOW on Windows, AVFOUNDATION on macOS), an OpenCV name such as "MSMF", or "ANY" to let OpenCV probe
     
     # Display Settings
     WINDOW_NAME = "Proctoring System"
@@ -26,6 +31,9 @@ class ProctorConfig:
     # Performance Settings
     MAX_FPS = 60  # Maximum FPS to process
     FRAME_SKIP = 2  # Process every 3rd frame (0 = process all, 1 = every 2nd, 2 = every 3rd)
+    DROP_STALE_FRAMES = True  # Skip to the newest camera frame when processing falls behind capture
+    THREADED_CAPTURE = True  # Read frames on a background thread so capture overlaps processing
+    THREADED_DISPLAY = False  # Show frames from a dedicated GUI thread so imshow/waitKey do not block processing (ignored on macOS)
     
     # Shared Memory Settings (for frontend frame streaming)
     SHARED_MEMORY_ENABLED = True  # Enable shared memory buffer for zero-copy frame sharing
@@ -36,6 +44,10 @@ class ProctorConfig:
     FACE_MODEL_SELECTION = 1  # 0 for short-range (<2m), 1 for full-range (<5m)
     FACE_MIN_DETECTION_CONFIDENCE = 0.7  # Minimum confidence for face detection
     FACE_MIN_TRACKING_CONFIDENCE = 0.5  # Minimum confidence for face tracking
+    FACE_DETECT_MAX_INPUT_WIDTH = 640  # Downscale frames wider than this before face landmarking (None = full size)
+    FACE_DETECT_DELEGATE = "CPU"  # MediaPipe inference backend: "CPU" (XNNPACK) or "GPU" (falls back to CPU if unavailable)
+    FACE_DETECT_REUSE_THRESHOLD = None  # Reuse the last landmarks while a 16x16 grey thumbnail differs by less than this mean level, e.g. 2.0 (None = run every frame; small gaze shifts may go unseen)
+    FACE_DETECT_STRIDE = 1  # Run the face landmarker every Nth frame, extrapolating landmarks in between (1 = every frame)
     
     # Face Mesh Visualization Settings
     SHOW_ALL_FACE_LANDMARKS = True  # Show all 478 face mesh points (set False for key points only)
@@ -73,12 +85,20 @@ class ProctorConfig:
     FACE_MATCHING_BACKEND = "Facenet"  # DeepFace backend: VGG-Face, Facenet, Facenet512, OpenFace, DeepFace, ArcFace, Dlib, SFace
     FACE_MATCHING_DISTANCE_METRIC = "cosine"  # Distance metric: cosine, euclidean, euclidean_l2
     FACE_MATCHING_THRESHOLD = 0.5  # Distance threshold (model-specific, lower = stricter)
+    FACE_EMBEDDING_CACHE_DIR = ".cache/face_embeddings"  # Cache for the participant embedding across runs (None = disabled)
     # Recommended thresholds (cosine): VGG-Face=0.40, Facenet=0.40, Facenet512=0.30, ArcFace=0.68, Dlib=0.07, SFace=0.593, OpenFace=0.10
     
     # Phone Detection Settings
     PHONE_DETECT_ENABLE = True  # Enable phone detection (requires phone detector model)
     PHONE_MODEL_PATH = "cv_models/phone.pt"  # Path to phone detection model
     PHONE_CONFIDENCE_THRESHOLD = 0.5  # Minimum confidence threshold for phone detection
+    PHONE_SKIP_WITHOUT_FACE = True  # Skip the phone model on frames where the face detector finds no face
+    PHONE_PARALLEL_DETECTION = False  # Run the phone model in a worker thread alongside face/eye detection (PHONE_BATCH_SIZE = 1 only; the no-face skip above no longer applies)
+    PHONE_IMGSZ = 640  # Fixed inference size for phone detection (static shape, matches the exported engine)
+    PHONE_BATCH_SIZE = 1  # Processed frames per phone model call; >1 raises GPU throughput at the cost of alert latency
+    PHONE_GPU_PREPROCESS = False  # Letterbox/normalize frames on the GPU (only used when the phone model runs on CUDA)
+    PHONE_USE_TENSORRT = False  # Use a TensorRT engine for phone detection when CUDA is available
+    PHONE_INT8_CALIBRATION_DATA = None  # Dataset YAML of representative webcam frames for INT8 calibration (None = FP16 engine)
     
     # Proctoring Settings
     PARTICIPANT_DATA_PATH = "data/participant.png"  # Single participant reference image
@@ -96,6 +116,7 @@ class ProctorConfig:
     # Alert Communication Settings
     ALERT_STATE_FILE_NAME = "alert_state.txt"  # File name for alert state communication
     ALERT_COOLDOWN_SECONDS = 5  # Minimum time between same alert types
+    MAX_ALERT_HISTORY = 1000  # Recent alerts kept in memory for the report (per-type totals are always complete)
     
     @classmethod
     def from_dict(cls, config_dict):
@@ -112,3 +133,19 @@ class ProctorConfig:
             for key, value in cls.__dict__.items()
             if not key.startswith('_') and key.isupper()
         }
+    
+    @classmethod
+    def frozen(cls):
+        """
+        Snapshot the current settings into an immutable namedtuple
+        
+        Call once after the configuration block and pass the result to the
+        pipeline: reads become tuple slot lookups instead of class attribute
+        lookups, the pipeline cannot change its settings while running, and
+        later changes to ProctorConfig no longer leak into a running session.
+        
+        Returns:
+            namedtuple: Current configuration values
+        """
+        settings = cls.to_dict()
+        return namedtuple('FrozenProctorConfig', settings)(**settings)
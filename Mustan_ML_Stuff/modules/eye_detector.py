@@ -12,6 +12,18 @@ from datetime import datetime
 from pathlib import Path
 from .base_detector import BaseDetector
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when Numba is not installed"""
+        def decorator(func):
+            return func
+        return decorator
+
 # MediaPipe eye and iris landmark indices (478-point face mesh)
 # These indices match the FaceDetector's MediaPipe Face Mesh output
 LEFT_EYE = [33, 133, 160, 159, 158, 144, 145, 153]
@@ -19,6 +31,70 @@ RIGHT_EYE = [362, 263, 387, 386, 385, 380, 374, 373]
 LEFT_IRIS = [468, 469, 470, 471, 472]
 RIGHT_IRIS = [473, 474, 475, 476, 477]
 
+# All eye and iris indices in one gather order: both eye contours, then both irises,
+# so each group reshapes to (2, n, 2) and is reduced for both eyes in one call
+EYE_LANDMARK_INDICES = LEFT_EYE + RIGHT_EYE + LEFT_IRIS + RIGHT_IRIS
+EYES_SLICE = slice(0, 16)
+IRISES_SLICE = slice(16, 26)
+EYE_NAMES = ('Left', 'Right')
+
+# Gaze direction codes returned by _gaze_core, indexing the two tables below
+GAZE_CENTER, GAZE_DOWN, GAZE_UP, GAZE_RIGHT, GAZE_LEFT = range(5)
+GAZE_STATUS = ("CENTER", "LOOKING DOWN", "LOOKING UP", "LOOKING RIGHT", "LOOKING LEFT")
+GAZE_IS_RISKY = (False, True, False, True, True)
+
+
+@njit(cache=True, fastmath=True)
+def _gaze_core(eye_cx, eye_cy, iris_x, iris_y, eye_width, eye_height,
+               down_threshold, up_threshold, horizontal_threshold):
+    """
+    Numeric core of gaze classification (JIT-compiled when Numba is available)
+    
+    Returns:
+        tuple: (gaze_code, horizontal_ratio, vertical_ratio)
+    """
+    # Normalize by eye dimensions
+    horizontal_ratio = (iris_x - eye_cx) / (eye_width / 2.0 + 1e-6)
+    vertical_ratio = (iris_y - eye_cy) / (eye_height / 2.0 + 1e-6)
+    
+    # Determine direction with priority to vertical
+    if vertical_ratio > down_threshold:
+        return GAZE_DOWN, horizontal_ratio, vertical_ratio
+    elif vertical_ratio < up_threshold:
+        return GAZE_UP, horizontal_ratio, vertical_ratio
+    elif horizontal_ratio > horizontal_threshold:
+        return GAZE_RIGHT, horizontal_ratio, vertical_ratio
+    elif horizontal_ratio < -horizontal_threshold:
+        return GAZE_LEFT, horizontal_ratio, vertical_ratio
+    return GAZE_CENTER, horizontal_ratio, vertical_ratio
+
+
+@njit(cache=True, fastmath=True)
+def _gaze_batch(geometry, down_threshold, up_threshold, horizontal_threshold):
+    """
+    Classify gaze for many eyes in one call (JIT-compiled when Numba is available)
+    
+    Args:
+        geometry: (N, 6) float64 array of eye_cx, eye_cy, iris_x, iris_y, eye_width, eye_height
+        
+    Returns:
+        tuple: (gaze_codes, horizontal_ratios, vertical_ratios) arrays of length N
+    """
+    n = geometry.shape[0]
+    codes = np.empty(n, dtype=np.int64)
+    horizontal_ratios = np.empty(n, dtype=np.float64)
+    vertical_ratios = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        code, horizontal_ratio, vertical_ratio = _gaze_core(
+            geometry[i, 0], geometry[i, 1], geometry[i, 2],
+            geometry[i, 3], geometry[i, 4], geometry[i, 5],
+            down_threshold, up_threshold, horizontal_threshold
+        )
+        codes[i] = code
+        horizontal_ratios[i] = horizontal_ratio
+        vertical_ratios[i] = vertical_ratio
+    return codes, horizontal_ratios, vertical_ratios
+
 
 class EyeMovementDetector(BaseDetector):
     """Detects and tracks eye movements using MediaPipe Face Landmarker (Tasks API)"""
@@ -89,6 +165,10 @@ class EyeMovementDetector(BaseDetector):
         self.eye_log_file = None
         self.session_id = None
         
+        # Warm up the gaze kernel so JIT compilation is not paid on the first frame
+        if NUMBA_AVAILABLE:
+            _gaze_batch(np.array([[0.0, 0.0, 0.0, 0.0, 1.0, 1.0]]), 0.1, -0.3, 0.3)
+        
         self.logger.info(f"Eye Movement Detector initialized (MediaPipe Face Landmarker)")
         
     
@@ -159,117 +239,99 @@ class EyeMovementDetector(BaseDetector):
         self.is_calibrated = False
         self.calibration_offsets = {}
     
-    def _get_eye_aspect_ratio(self, eye_landmarks):
+    def _get_eye_aspect_ratios(self, eyes):
         """
-        Calculate Eye Aspect Ratio (EAR) for blink detection
+        Calculate Eye Aspect Ratio (EAR) for blink detection, for both eyes at once
         
         Args:
-            eye_landmarks: Array of eye landmark coordinates
+            eyes: (2, 8, 2) array of eye contour coordinates (left, right)
             
         Returns:
-            float: Eye aspect ratio
+            np.ndarray: (2,) eye aspect ratios
         """
-        # Vertical distances
-        v1 = np.linalg.norm(eye_landmarks[1] - eye_landmarks[5])
-        v2 = np.linalg.norm(eye_landmarks[2] - eye_landmarks[4])
-        
-        # Horizontal distance
-        h = np.linalg.norm(eye_landmarks[0] - eye_landmarks[3])
+        # Vertical distances (1-5, 2-4) and horizontal distance (0-3) per eye
+        deltas = (eyes[:, [1, 2, 0]] - eyes[:, [5, 4, 3]]).astype(np.float64)
+        distances = np.sqrt((deltas * deltas).sum(axis=2))
         
         # EAR formula
-        ear = (v1 + v2) / (2.0 * h + 1e-6)
-        return ear
+        return (distances[:, 0] + distances[:, 1]) / (2.0 * distances[:, 2] + 1e-6)
     
-    def _get_gaze_direction(self, eye_center, iris_center, eye_width, eye_height):
+    def _classify_gaze_batch(self, eye_datas):
         """
-        Determine gaze direction based on iris position relative to eye center
+        Determine gaze direction and alert state for all open eyes of a frame in one kernel call
         
         Args:
-            eye_center: Eye center coordinates (x, y)
-            iris_center: Iris center coordinates (x, y)
-            eye_width: Eye width in pixels
-            eye_height: Eye height in pixels
-            
-        Returns:
-            tuple: (direction_status, is_risky, horizontal_ratio, vertical_ratio)
+            eye_datas: List of eye data dicts from _process_eyes (updated in place)
         """
-        # Normalize by eye dimensions
-        horizontal_ratio = (iris_center[0] - eye_center[0]) / (eye_width / 2 + 1e-6)
-        vertical_ratio = (iris_center[1] - eye_center[1]) / (eye_height / 2 + 1e-6)
-        
-        # Determine direction with priority to vertical
-        if vertical_ratio > self.vertical_down_threshold:
-            return "LOOKING DOWN", True, horizontal_ratio, vertical_ratio
-        elif vertical_ratio < self.vertical_up_threshold:
-            return "LOOKING UP", False, horizontal_ratio, vertical_ratio
-        elif horizontal_ratio > self.horizontal_threshold:
-            return "LOOKING RIGHT", True, horizontal_ratio, vertical_ratio
-        elif horizontal_ratio < -self.horizontal_threshold:
-            return "LOOKING LEFT", True, horizontal_ratio, vertical_ratio
-        else:
-            return "CENTER", False, horizontal_ratio, vertical_ratio
+        geometry = np.array([
+            (e['eye_center'][0], e['eye_center'][1],
+             e['iris_center'][0], e['iris_center'][1],
+             e['eye_width'], e['eye_height'])
+            for e in eye_datas
+        ], dtype=np.float64)
+        
+        codes, h_ratios, v_ratios = _gaze_batch(
+            geometry,
+            self.vertical_down_threshold,
+            self.vertical_up_threshold,
+            self.horizontal_threshold
+        )
+        
+        for eye_data, code, h_ratio, v_ratio in zip(eye_datas, codes, h_ratios, v_ratios):
+            eye_data['status'] = GAZE_STATUS[code]
+            eye_data['is_risky'] = GAZE_IS_RISKY[code]
+            eye_data['horizontal_ratio'] = float(h_ratio)
+            eye_data['vertical_ratio'] = float(v_ratio)
+            
+            # Determine if alert should be raised
+            if code == GAZE_DOWN:
+                eye_data['alert'] = self.enable_looking_down_alert
+            elif code == GAZE_LEFT or code == GAZE_RIGHT:
+                eye_data['alert'] = self.enable_looking_away_alert
+            else:
+                eye_data['alert'] = False
     
-    def _process_eye(self, landmarks, eye_indices, iris_indices, img_w, img_h, eye_name):
+    def _process_eyes(self, points):
         """
-        Process eye landmarks to extract eye center, iris center, and dimensions
+        Process eye landmarks to extract eye center, iris center, and dimensions for both eyes
         
         Args:
-            landmarks: List of landmark dicts from FaceDetector with format {'x': int, 'y': int, 'z': float}
-            eye_indices: List of landmark indices for eye contour
-            iris_indices: List of landmark indices for iris
-            img_w: Image width
-            img_h: Image height
-            eye_name: Name of the eye (Left/Right)
+            points: (26, 2) array of pixel coordinates gathered in EYE_LANDMARK_INDICES order
             
         Returns:
-            dict: Eye data including center, iris position, dimensions, and EAR
+            list: [left, right] eye data dicts including center, iris position, dimensions, and EAR
         """
-        # Get eye landmark coordinates (already in pixel coordinates from FaceDetector)
-        eye_points = []
-        for idx in eye_indices:
-            if idx < len(landmarks):
-                point = landmarks[idx]
-                x = point['x']
-                y = point['y']
-                eye_points.append([x, y])
-        
-        eye_points = np.array(eye_points)
-        
-        # Calculate eye center and dimensions
-        eye_center = eye_points.mean(axis=0).astype(int)
-        eye_left = eye_points[:, 0].min()
-        eye_right = eye_points[:, 0].max()
-        eye_top = eye_points[:, 1].min()
-        eye_bottom = eye_points[:, 1].max()
-        
-        eye_width = eye_right - eye_left
-        eye_height = eye_bottom - eye_top
+        eyes = points[EYES_SLICE].reshape(2, 8, 2)
+        irises = points[IRISES_SLICE].reshape(2, 5, 2)
+        
+        # Calculate eye centers and bounding boxes for both eyes in one reduction each
+        eye_centers = eyes.mean(axis=1).astype(int)
+        eye_mins = eyes.min(axis=1)
+        eye_maxs = eyes.max(axis=1)
         
         # Calculate Eye Aspect Ratio for blink detection
-        ear = self._get_eye_aspect_ratio(eye_points)
-        
-        # Get iris center (landmarks 468-477 are iris points)
-        iris_points = []
-        for idx in iris_indices:
-            if idx < len(landmarks):
-                point = landmarks[idx]
-                x = point['x']
-                y = point['y']
-                iris_points.append([x, y])
-        
-        iris_center = np.array(iris_points).mean(axis=0).astype(int)
-        
-        return {
-            'eye_name': eye_name,
-            'eye_center': eye_center,
-            'iris_center': iris_center,
-            'eye_width': eye_width,
-            'eye_height': eye_height,
-            'eye_points': eye_points,
-            'iris_points': iris_points,
-            'ear': ear,
-            'bbox': (eye_left, eye_top, eye_right, eye_bottom)
-        }
+        ears = self._get_eye_aspect_ratios(eyes)
+        
+        # Get iris centers (landmarks 468-477 are iris points)
+        iris_centers = irises.mean(axis=1).astype(int)
+        
+        eye_results = []
+        for i, eye_name in enumerate(EYE_NAMES):
+            eye_left, eye_top = eye_mins[i]
+            eye_right, eye_bottom = eye_maxs[i]
+            eye_results.append({
+                'eye_name': eye_name,
+                'eye_center': eye_centers[i],
+                'iris_center': iris_centers[i],
+                'eye_width': eye_right - eye_left,
+                'eye_height': eye_bottom - eye_top,
+                'eye_points': eyes[i],
+                'iris_points': irises[i],
+                'ear': ears[i],
+                'bbox': (eye_left, eye_top, eye_right, eye_bottom)
+            })
+        
+        return eye_results
     
     def detect(self, frame, face_meshes):
         """
@@ -277,7 +339,7 @@ class EyeMovementDetector(BaseDetector):
         
         Args:
             frame: Input frame (BGR)
-            face_meshes: List of face mesh data from FaceDetector (must contain 'landmarks')
+            face_meshes: List of face mesh data from FaceDetector (must contain 'landmarks_xy')
             
         Returns:
             list: List of eye detections with gaze analysis
@@ -296,72 +358,41 @@ class EyeMovementDetector(BaseDetector):
                 }]
             return []
         
-        h, w, _ = frame.shape
         all_detections = []
+        open_eyes = []
         
         # Process each face mesh
         for face_data in face_meshes:
-            landmarks = face_data.get('landmarks')
+            landmarks_xy = face_data.get('landmarks_xy')
             
-            if not landmarks or len(landmarks) < 478:
+            if landmarks_xy is None or len(landmarks_xy) < 478:
                 self.logger.debug("Face mesh missing landmarks (need at least 478 points for iris tracking)")
                 continue
             
-            try:
-                # Process both eyes
-                left_eye_data = self._process_eye(
-                    landmarks, 
-                    LEFT_EYE, 
-                    LEFT_IRIS, 
-                    w, h,
-                    'Left'
-                )
+            # Gather only the 26 eye/iris points instead of touching the whole mesh
+            points = landmarks_xy[EYE_LANDMARK_INDICES]
+            
+            # Analyze each eye
+            for eye_data in self._process_eyes(points):
+                # Collapsed landmarks (eye out of view) carry no gaze information
+                if eye_data['eye_width'] <= 0:
+                    continue
                 
-                right_eye_data = self._process_eye(
-                    landmarks, 
-                    RIGHT_EYE, 
-                    RIGHT_IRIS, 
-                    w, h,
-                    'Right'
-                )
+                # Check if eye is closed
+                if eye_data['ear'] < self.closed_threshold:
+                    eye_data['status'] = "EYES CLOSED"
+                    eye_data['is_risky'] = False
+                    eye_data['horizontal_ratio'] = 0.0
+                    eye_data['vertical_ratio'] = 0.0
+                    eye_data['alert'] = False
+                else:
+                    # Gaze is classified below, together with the open eyes of every face
+                    open_eyes.append(eye_data)
                 
-                # Analyze each eye
-                for eye_data in [left_eye_data, right_eye_data]:
-                    # Check if eye is closed
-                    if eye_data['ear'] < self.closed_threshold:
-                        eye_data['status'] = "EYES CLOSED"
-                        eye_data['is_risky'] = False
-                        eye_data['horizontal_ratio'] = 0.0
-                        eye_data['vertical_ratio'] = 0.0
-                        eye_data['alert'] = False
-                    else:
-                        # Determine gaze direction
-                        status, is_risky, h_ratio, v_ratio = self._get_gaze_direction(
-                            eye_data['eye_center'],
-                            eye_data['iris_center'],
-                            eye_data['eye_width'],
-                            eye_data['eye_height']
-                        )
-                        
-                        eye_data['status'] = status
-                        eye_data['is_risky'] = is_risky
-                        eye_data['horizontal_ratio'] = h_ratio
-                        eye_data['vertical_ratio'] = v_ratio
-                        
-                        # Determine if alert should be raised
-                        alert = False
-                        if "LOOKING DOWN" in status and self.enable_looking_down_alert:
-                            alert = True
-                        elif ("LOOKING LEFT" in status or "LOOKING RIGHT" in status) and self.enable_looking_away_alert:
-                            alert = True
-                        
-                        eye_data['alert'] = alert
-                    
-                    all_detections.append(eye_data)
-            
-            except Exception as e:
-                self.logger.error(f"Error processing eyes: {e}")
-                continue
+                all_detections.append(eye_data)
+        
+        if open_eyes:
+            self._classify_gaze_batch(open_eyes)
         
         return all_detections 
     
@@ -435,16 +466,17 @@ class EyeMovementDetector(BaseDetector):
                        cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 0), 1)
         
         return frame
-        
-        return frame
     
     def process_frame(self, frame, face_meshes=None, draw=True):
         """
         Process frame: detect eyes and calculate gaze direction
         
+        Annotations are drawn directly onto the passed frame; callers that need the
+        original pixels must pass a copy.
+        
         Args:
-            frame: Input frame (BGR)
-            face_meshes: Not used (kept for compatibility)
+            frame: Input frame (BGR), annotated in place
+            face_meshes: Face mesh data from FaceDetector
             draw: Whether to draw annotations
             
         Returns:
@@ -453,7 +485,7 @@ class EyeMovementDetector(BaseDetector):
         if not self.enabled:
             return frame, {"enabled": False}
         
-        processed_frame = frame.copy()
+        processed_frame = frame
         
         # Detect eyes and analyze gaze
         detections = self.detect(frame, face_meshes)
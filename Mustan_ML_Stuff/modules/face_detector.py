@@ -4,6 +4,7 @@ Handles face detection using MediaPipe Tasks Vision API for optimal performance
 """
 
 import logging
+from collections.abc import Sequence
 import cv2
 import numpy as np
 from pathlib import Path
@@ -19,6 +20,39 @@ except ImportError:
     logging.warning("MediaPipe not available. Install with: pip install mediapipe")
 
 
+# Landmarks drawn in key-point mode: eye corners, nose tip, mouth corners
+KEY_LANDMARK_INDICES = (33, 133, 362, 263, 1, 61, 291)
+
+
+class LandmarkList(Sequence):
+    """
+    Read-only view of a face's landmark arrays as legacy {'x', 'y', 'z'} dicts
+    
+    Dicts are built lazily on access, so callers that use 'landmarks_xy' /
+    'landmarks_z' directly never pay for them.
+    """
+    
+    __slots__ = ('_xy', '_z')
+    
+    def __init__(self, xy, z):
+        """
+        Args:
+            xy: (N, 2) int32 array of pixel coordinates
+            z: (N,) float32 array of relative depths
+        """
+        self._xy = xy
+        self._z = z
+    
+    def __len__(self):
+        return len(self._xy)
+    
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        x, y = self._xy[idx].tolist()
+        return {'x': x, 'y': y, 'z': float(self._z[idx])}
+
+
 class FaceDetector(BaseDetector):
     """
     Face detection using MediaPipe Tasks Vision API
@@ -32,7 +66,11 @@ class FaceDetector(BaseDetector):
         enabled=True,
         model_selection=1,  # Legacy parameter, kept for compatibility
         min_detection_confidence=0.5,
-        min_tracking_confidence=0.5
+        min_tracking_confidence=0.5,
+        max_input_width=None,
+        delegate='CPU',
+        reuse_threshold=None,
+        detect_stride=1
     ):
         """
         Initialize MediaPipe Tasks Vision face landmarker
@@ -43,6 +81,11 @@ class FaceDetector(BaseDetector):
             model_selection: Legacy parameter (not used in Tasks Vision API)
             min_detection_confidence: Minimum confidence for detection (0.0-1.0)
             min_tracking_confidence: Minimum confidence for tracking (0.0-1.0)
+            max_input_width: Downscale wider frames to this width before landmarking (None = full size)
+            delegate: MediaPipe inference backend, 'CPU' or 'GPU' (falls back to CPU if GPU fails)
+            reuse_threshold: Mean grey-level difference of a 16x16 thumbnail below which the last
+                             landmarks are reused instead of running the landmarker (None = always run)
+            detect_stride: Run the landmarker on every Nth frame and extrapolate landmarks in between (1 = every frame)
         """
         super().__init__(name, enabled)
         
@@ -52,6 +95,8 @@ class FaceDetector(BaseDetector):
         self.model_selection = model_selection
         self.min_detection_confidence = min_detection_confidence
         self.min_tracking_confidence = min_tracking_confidence
+        self.max_input_width = max_input_width
+        self.delegate = delegate
         
         # MediaPipe Tasks Vision face landmarker
         self.face_landmarker = None
@@ -59,6 +104,22 @@ class FaceDetector(BaseDetector):
         # Frame counter for timestamp generation
         self.frame_count = 0
         
+        # Reusable RGB conversion buffer (reallocated only when the input size changes)
+        self._rgb_buf = None
+        
+        # Near-duplicate frame reuse: last landmarker result and its frame thumbnail
+        self.reuse_threshold = reuse_threshold
+        self._last_meshes = None
+        self._last_thumb = None
+        
+        # Strided detection: the last two landmarker results (newest first) and the frame
+        # counts they were taken at, for constant-velocity extrapolation on skipped frames
+        self.detect_stride = max(1, int(detect_stride))
+        self._prev_meshes = None
+        self._prev2_meshes = None
+        self._prev_frame = 0
+        self._prev2_frame = 0
+        
         self.logger.info(f"Initializing MediaPipe Tasks Vision Face Landmarker")
     
     def load_model(self, model_path=None):
@@ -83,19 +144,14 @@ class FaceDetector(BaseDetector):
             
             self.logger.info(f"Loading face landmarker model from: {model_path}")
             
-            # Configure FaceLandmarker with base options
-            base_options = python.BaseOptions(model_asset_path=str(model_file))
-            options = vision.FaceLandmarkerOptions(
-                base_options=base_options,
-                running_mode=vision.RunningMode.VIDEO,
-                num_faces=5,
-                min_face_detection_confidence=self.min_detection_confidence,
-                min_face_presence_confidence=self.min_tracking_confidence,
-                min_tracking_confidence=self.min_tracking_confidence,
-                output_face_blendshapes=False,
-                output_facial_transformation_matrixes=False
-            )
-            self.face_landmarker = vision.FaceLandmarker.create_from_options(options)
+            delegate = self._get_delegate()
+            try:
+                self.face_landmarker = self._create_landmarker(model_file, delegate)
+            except RuntimeError as e:
+                if delegate == python.BaseOptions.Delegate.CPU:
+                    raise
+                self.logger.warning(f"GPU delegate unavailable ({e}), falling back to CPU")
+                self.face_landmarker = self._create_landmarker(model_file, python.BaseOptions.Delegate.CPU)
             
             self.initialized = True
             self.logger.info("MediaPipe Tasks Vision Face Landmarker loaded successfully")
@@ -105,6 +161,43 @@ class FaceDetector(BaseDetector):
             self.logger.error(f"Error loading MediaPipe Tasks Vision Face Landmarker: {e}")
             return False
     
+    def _get_delegate(self):
+        """
+        Map the configured delegate name to MediaPipe's enum
+        
+        Returns:
+            python.BaseOptions.Delegate: GPU if requested, otherwise CPU
+        """
+        if str(self.delegate).upper() == 'GPU':
+            self.logger.info("Running face landmarker on the GPU delegate")
+            return python.BaseOptions.Delegate.GPU
+        return python.BaseOptions.Delegate.CPU
+    
+    def _create_landmarker(self, model_file, delegate):
+        """
+        Create the FaceLandmarker on the given delegate
+        
+        Args:
+            model_file: Path to the face landmarker model file (.task)
+            delegate: python.BaseOptions.Delegate to run inference on
+            
+        Returns:
+            vision.FaceLandmarker instance
+        """
+        # Configure FaceLandmarker with base options
+        base_options = python.BaseOptions(model_asset_path=str(model_file), delegate=delegate)
+        options = vision.FaceLandmarkerOptions(
+            base_options=base_options,
+            running_mode=vision.RunningMode.VIDEO,
+            num_faces=5,
+            min_face_detection_confidence=self.min_detection_confidence,
+            min_face_presence_confidence=self.min_tracking_confidence,
+            min_tracking_confidence=self.min_tracking_confidence,
+            output_face_blendshapes=False,
+            output_facial_transformation_matrixes=False
+        )
+        return vision.FaceLandmarker.create_from_options(options)
+    
     def detect(self, frame):
         """
         Detect faces in frame and return face meshes using Face Landmarker
@@ -113,84 +206,170 @@ class FaceDetector(BaseDetector):
             frame: Input frame (numpy array in BGR format)
             
         Returns:
-            list: List of face mesh results with landmarks and bounding boxes
+            list: List of face mesh results with bounding boxes and landmarks, stored as
+                  'landmarks_xy' ((N, 2) int32 pixels) and 'landmarks_z' ((N,) float32);
+                  'landmarks' is a lazy LandmarkList of dicts for legacy callers
         """
         if not self.initialized:
             self.logger.warning("Detector not initialized")
             return []
         
         try:
-            # Convert BGR to RGB for MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             h, w = frame.shape[:2]
             
+            # Reuse the last landmarks while the frame is nearly identical to the one they came from
+            thumb = None
+            if self.reuse_threshold:
+                thumb = cv2.cvtColor(cv2.resize(frame, (16, 16), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+                if (self._last_thumb is not None
+                        and cv2.absdiff(thumb, self._last_thumb).mean() < self.reuse_threshold):
+                    return [dict(face_data) for face_data in self._last_meshes]
+            
+            # Advance the video timestamp on every frame, including extrapolated ones, so the
+            # landmarker's tracker sees consistent time when real inference resumes
+            self.frame_count += 1
+            if (self.detect_stride > 1 and self._prev_meshes is not None
+                    and self.frame_count % self.detect_stride != 0):
+                return self._extrapolate(w, h)
+            
+            # The landmark model runs at a fixed low resolution, so feed it a downscaled
+            # frame; landmarks are normalized and still map back using the full w, h
+            detect_frame = frame
+            if self.max_input_width and w > self.max_input_width:
+                small_h = int(round(h * self.max_input_width / w))
+                detect_frame = cv2.resize(frame, (self.max_input_width, small_h), interpolation=cv2.INTER_AREA)
+            
+            # Convert BGR to RGB for MediaPipe into the reusable buffer
+            if self._rgb_buf is None or self._rgb_buf.shape != detect_frame.shape:
+                self._rgb_buf = np.empty_like(detect_frame)
+            rgb_frame = cv2.cvtColor(detect_frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+            
             # Create MediaPipe Image
             mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
             
             # Generate timestamp in milliseconds for video mode
-            self.frame_count += 1
             timestamp_ms = self.frame_count * 33  # Assuming ~30fps
             
             # Detect faces using Face Landmarker
             landmarker_result = self.face_landmarker.detect_for_video(mp_image, timestamp_ms)
             
             if not landmarker_result.face_landmarks:
-                return []
+                return self._remember(thumb, [])
             
             face_meshes = []
+            scale = np.array([w, h], dtype=np.float64)
             
             # Process each detected face
             for face_landmarks in landmarker_result.face_landmarks:
-                # Convert normalized landmarks to pixel coordinates
-                landmarks = []
-                x_coords = []
-                y_coords = []
-                
-                for landmark in face_landmarks:
-                    x_px = int(landmark.x * w)
-                    y_px = int(landmark.y * h)
-                    landmarks.append({
-                        'x': x_px,
-                        'y': y_px,
-                        'z': landmark.z if hasattr(landmark, 'z') else 0.0
-                    })
-                    x_coords.append(x_px)
-                    y_coords.append(y_px)
+                if not face_landmarks:
+                    continue
                 
-                # Calculate bounding box from landmarks
-                if x_coords and y_coords:
-                    x_min = max(0, min(x_coords))
-                    y_min = max(0, min(y_coords))
-                    x_max = min(w, max(x_coords))
-                    y_max = min(h, max(y_coords))
-                    
-                    # Add padding to bounding box
-                    padding = 20
-                    x_min = max(0, x_min - padding)
-                    y_min = max(0, y_min - padding)
-                    x_max = min(w, x_max + padding)
-                    y_max = min(h, y_max + padding)
-                    
-                    face_data = {
-                        'bbox': {
-                            'x': x_min,
-                            'y': y_min,
-                            'w': x_max - x_min,
-                            'h': y_max - y_min
-                        },
-                        'confidence': 1.0,  # Face Landmarker doesn't provide per-face confidence
-                        'landmarks': landmarks
-                    }
-                    
-                    face_meshes.append(face_data)
+                # Convert normalized landmarks to pixel coordinates in one vectorized step
+                points = (np.array([(lm.x, lm.y) for lm in face_landmarks], dtype=np.float64) * scale).astype(np.int32)
+                z_values = np.array([lm.z if hasattr(lm, 'z') else 0.0 for lm in face_landmarks], dtype=np.float32)
+                face_meshes.append(self._build_face(points, z_values, w, h))
             
-            return face_meshes
+            return self._remember(thumb, face_meshes)
             
         except Exception as e:
             self.logger.error(f"Error detecting faces: {e}")
             return []
     
-    def draw_faces(self, frame, face_meshes, color=(0, 255, 0), thickness=2, show_all_landmarks=False, show_landmark_numbers=False):
+    @staticmethod
+    def _build_face(points, z_values, w, h, padding=20):
+        """
+        Build one face mesh dict from its landmark arrays
+        
+        Args:
+            points: (N, 2) int32 landmark pixel coordinates
+            z_values: (N,) float32 landmark depths
+            w, h: Frame size the bounding box is clipped to
+            padding: Bounding box padding around the landmarks, in pixels
+            
+        Returns:
+            dict: Face mesh data in the format documented on detect
+        """
+        # Calculate bounding box from landmarks, with padding
+        x_min = max(0, int(points[:, 0].min()) - padding)
+        y_min = max(0, int(points[:, 1].min()) - padding)
+        x_max = min(w, int(points[:, 0].max()) + padding)
+        y_max = min(h, int(points[:, 1].max()) + padding)
+        
+        return {
+            'bbox': {
+                'x': x_min,
+                'y': y_min,
+                'w': x_max - x_min,
+                'h': y_max - y_min
+            },
+            'confidence': 1.0,  # Face Landmarker doesn't provide per-face confidence
+            'landmarks_xy': points,
+            'landmarks_z': z_values,
+            'landmarks': LandmarkList(points, z_values)
+        }
+    
+    def _extrapolate(self, w, h):
+        """
+        Predict face meshes for a skipped frame from the last two landmarker runs
+        
+        Landmarks move at the velocity observed between those runs (constant velocity);
+        with only one run, or a change in face count, the last result is held.
+        MediaPipe does not keep face order between runs, so each face is paired with
+        the nearest face (by bbox centre) of the older run; a face without a partner
+        within one face width is held as well.
+        
+        Returns:
+            list: Face mesh dicts in the format documented on detect
+        """
+        prev, prev2 = self._prev_meshes, self._prev2_meshes
+        if prev2 is None or len(prev2) != len(prev) or self._prev_frame == self._prev2_frame:
+            return [dict(face_data) for face_data in prev]
+        
+        # Fraction of the last inter-run interval elapsed since the newest run
+        t = (self.frame_count - self._prev_frame) / (self._prev_frame - self._prev2_frame)
+        
+        centers2 = [self._bbox_center(face_data2) for face_data2 in prev2]
+        
+        face_meshes = []
+        for face_data in prev:
+            # Pair with the nearest face of the older run; one farther than a face width is someone else
+            cx, cy = self._bbox_center(face_data)
+            dist2, nearest = min(
+                ((cx - cx2) ** 2 + (cy - cy2) ** 2, i) for i, (cx2, cy2) in enumerate(centers2)
+            )
+            if dist2 > face_data['bbox']['w'] ** 2:
+                face_meshes.append(dict(face_data))
+                continue
+            face_data2 = prev2[nearest]
+            xy = face_data['landmarks_xy']
+            xy2 = face_data2['landmarks_xy']
+            if xy.shape != xy2.shape:
+                face_meshes.append(dict(face_data))
+                continue
+            points = np.rint(xy + (xy - xy2) * t)
+            # Keep predicted landmarks inside the frame, as the landmarker's own output is
+            points = np.clip(points, 0, [w - 1, h - 1]).astype(np.int32)
+            face_meshes.append(self._build_face(points, face_data['landmarks_z'], w, h))
+        return face_meshes
+    
+    @staticmethod
+    def _bbox_center(face_data):
+        """Centre (x, y) of a face mesh's bounding box"""
+        bbox = face_data['bbox']
+        return bbox['x'] + bbox['w'] / 2, bbox['y'] + bbox['h'] / 2
+    
+    def _remember(self, thumb, face_meshes):
+        """Cache a fresh landmarker result for near-duplicate reuse and strided extrapolation"""
+        if self.detect_stride > 1:
+            self._prev2_meshes, self._prev2_frame = self._prev_meshes, self._prev_frame
+            self._prev_meshes, self._prev_frame = face_meshes, self.frame_count
+        if thumb is not None:
+            self._last_thumb = thumb
+            self._last_meshes = face_meshes
+            face_meshes = [dict(face_data) for face_data in face_meshes]
+        return face_meshes
+    
+    def draw_faces(self, frame, face_meshes, color=(0, 255, 0), thickness=2, show_all_landmarks=False, show_landmark_numbers=False, in_place=False):
         """
         Draw bounding boxes and landmarks on detected faces
         
@@ -201,11 +380,12 @@ class FaceDetector(BaseDetector):
             thickness: Box thickness
             show_all_landmarks: If True, shows all 478 face mesh points. If False, shows only key points
             show_landmark_numbers: If True, displays landmark index numbers (use with caution - lots of text!)
+            in_place: Draw directly on frame instead of a copy (for caller-owned scratch buffers)
             
         Returns:
             Annotated frame
         """
-        output_frame = frame.copy()
+        output_frame = frame if in_place else frame.copy()
         
         for face_data in face_meshes:
             bbox = face_data['bbox']
@@ -228,29 +408,28 @@ class FaceDetector(BaseDetector):
             )
             
             # Draw landmarks based on mode
-            if face_data['landmarks'] and len(face_data['landmarks']) > 0:
+            points = face_data.get('landmarks_xy')
+            if points is not None and len(points) > 0:
                 if show_all_landmarks:
                     # Draw all 478 face mesh landmarks
-                    for idx, lm in enumerate(face_data['landmarks']):
+                    for idx, (px, py) in enumerate(points.tolist()):
                         # Use different colors for different facial regions
                         if idx < 468:  # Face contour and features
                             point_color = (0, 255, 255)  # Yellow
                         else:  # Iris landmarks (468-477)
                             point_color = (255, 0, 255)  # Magenta for iris points
                         
-                        cv2.circle(output_frame, (lm['x'], lm['y']), 1, point_color, -1)
+                        cv2.circle(output_frame, (px, py), 1, point_color, -1)
                         
                         # Optionally draw landmark numbers (warning: lots of text!)
                         if show_landmark_numbers and idx % 10 == 0:  # Show every 10th number
-                            cv2.putText(output_frame, str(idx), (lm['x']+2, lm['y']-2),
+                            cv2.putText(output_frame, str(idx), (px+2, py-2),
                                        cv2.FONT_HERSHEY_PLAIN, 0.3, (255, 255, 255), 1)
                 else:
                     # Draw only key points (eyes, nose, mouth) for clarity
-                    key_indices = [33, 133, 362, 263, 1, 61, 291]  # Eyes, nose tip, mouth corners
-                    for idx in key_indices:
-                        if idx < len(face_data['landmarks']):
-                            lm = face_data['landmarks'][idx]
-                            cv2.circle(output_frame, (lm['x'], lm['y']), 2, (0, 255, 255), -1)
+                    key_indices = [idx for idx in KEY_LANDMARK_INDICES if idx < len(points)]
+                    for px, py in points[key_indices].tolist():
+                        cv2.circle(output_frame, (px, py), 2, (0, 255, 255), -1)
         
         return output_frame
     
@@ -293,20 +472,13 @@ class FaceDetector(BaseDetector):
     
     def cleanup(self):
         """Release MediaPipe FaceLandmarker resources"""
-        print(f"[DEBUG] === ENTERING {self.name}.cleanup() ===")
         if self.face_landmarker:
             try:
-                print(f"[DEBUG] {self.name} Step 0: Releasing face_landmarker")
                 # MediaPipe FaceLandmarker doesn't have explicit close, set to None for GC
                 self.face_landmarker = None
-                print(f"[DEBUG] {self.name} Step 1: Set to None")
                 self.initialized = False
                 self.logger.info(f"{self.name} - MediaPipe FaceLandmarker resources released")
-                print(f"[DEBUG] {self.name} Step 2: Cleanup complete")
             except Exception as e:
-                print(f"[DEBUG] ERROR in {self.name}.cleanup(): {e}")
                 self.logger.error(f"Error cleaning up {self.name}: {e}")
         else:
-            print(f"[DEBUG] {self.name}: No resources to clean")
             self.logger.info(f"{self.name} cleanup complete (no resources loaded)")
-        print(f"[DEBUG] === EXITING {self.name}.cleanup() ===")
@@ -4,6 +4,7 @@ Handles face verification/matching using DeepFace with configurable backends
 Optimized to accept pre-cropped faces to skip redundant detection
 """
 
+import hashlib
 import logging
 import cv2
 import numpy as np
@@ -33,7 +34,8 @@ class FaceMatcher(BaseDetector):
         model_name='Facenet512',  # DeepFace model: VGG-Face, Facenet, Facenet512, OpenFace, DeepFace, ArcFace, Dlib, SFace
         distance_metric='cosine',  # Distance metric: cosine, euclidean, euclidean_l2
         distance_threshold=0.4,  # Distance threshold for matching (lower = stricter, varies by model)
-        participant_image_path='data/participant.png'
+        participant_image_path='data/participant.png',
+        embedding_cache_dir=None
     ):
         """
         Initialize DeepFace face matcher with configurable backend
@@ -45,6 +47,7 @@ class FaceMatcher(BaseDetector):
             distance_metric: Distance metric for comparison (cosine, euclidean, euclidean_l2)
             distance_threshold: Distance threshold for matching (model-specific, lower = stricter)
             participant_image_path: Path to participant reference image
+            embedding_cache_dir: Directory for cached participant embeddings (None = always recompute)
             
         Note:
             Recommended thresholds by model (cosine distance):
@@ -65,10 +68,14 @@ class FaceMatcher(BaseDetector):
         self.distance_metric = distance_metric
         self.distance_threshold = distance_threshold
         self.participant_image_path = participant_image_path
+        self.embedding_cache_dir = embedding_cache_dir
         
         # Cached participant embedding (computed once, reused for all frames)
         self.participant_embedding = None
         
+        # Unit-length copy of the participant embedding, so per-frame distances need one norm
+        self.participant_unit = None
+        
         # Cached embedding dimensions
         self.embedding_dim = None
         
@@ -123,6 +130,15 @@ class FaceMatcher(BaseDetector):
             
             self.logger.info(f"Loading participant image: {participant_path}")
             
+            # Reuse the embedding from a previous run if the image and backend are unchanged
+            cache_path = self._embedding_cache_path(participant_path)
+            if cache_path is not None and cache_path.exists():
+                self.participant_embedding = np.load(cache_path)
+                self.participant_unit = self.participant_embedding / np.linalg.norm(self.participant_embedding)
+                self.embedding_dim = len(self.participant_embedding)
+                self.logger.info(f"Participant embedding loaded from cache: {cache_path}")
+                return
+            
             # Load and preprocess image
             participant_image = cv2.imread(str(participant_path))
             if participant_image is None:
@@ -137,7 +153,10 @@ class FaceMatcher(BaseDetector):
             self.participant_embedding = self._extract_embedding_with_detection(participant_image)
             
             if self.participant_embedding is not None:
+                self.participant_unit = self.participant_embedding / np.linalg.norm(self.participant_embedding)
                 self.logger.info(f"Participant embedding cached: shape={self.participant_embedding.shape}")
+                if cache_path is not None:
+                    self._save_embedding_cache(cache_path)
             else:
                 self.logger.error("Failed to extract participant embedding - ensure participant.png contains a clear face")
                 
@@ -145,6 +164,31 @@ class FaceMatcher(BaseDetector):
             self.logger.error(f"Error loading participant embedding: {e}")
             self.participant_embedding = None
     
+    def _embedding_cache_path(self, participant_path):
+        """
+        Cache file for a participant image, keyed by the image content and the model backend
+        
+        Args:
+            participant_path: Path to the participant image
+            
+        Returns:
+            Path or None: Cache file path, or None when caching is disabled
+        """
+        if not self.embedding_cache_dir:
+            return None
+        
+        digest = hashlib.sha1(participant_path.read_bytes()).hexdigest()[:16]
+        return Path(self.embedding_cache_dir) / f"participant_{digest}_{self.model_name}.npy"
+    
+    def _save_embedding_cache(self, cache_path):
+        """Write the participant embedding to the cache (failures only cost a recompute next run)"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            np.save(cache_path, self.participant_embedding)
+            self.logger.info(f"Participant embedding saved to cache: {cache_path}")
+        except OSError as e:
+            self.logger.warning(f"Could not cache participant embedding: {e}")
+    
     def _extract_embedding_with_detection(self, full_image):
         """
         Extract embedding from a full image by detecting face first
@@ -274,6 +318,29 @@ class FaceMatcher(BaseDetector):
         
         return float(distance)
     
+    def _participant_distance(self, embedding):
+        """
+        Distance from an embedding to the cached participant embedding
+        
+        Same result as _compute_distance(embedding, self.participant_embedding), but reuses
+        the precomputed participant unit vector instead of re-normalizing it every frame
+        
+        Args:
+            embedding: Embedding of the live face
+            
+        Returns:
+            float: Distance score (lower = more similar)
+        """
+        if self.distance_metric == 'euclidean':
+            return float(np.linalg.norm(embedding - self.participant_embedding))
+        
+        unit = embedding / np.linalg.norm(embedding)
+        if self.distance_metric == 'euclidean_l2':
+            return float(np.linalg.norm(unit - self.participant_unit))
+        
+        # Cosine (default)
+        return float(1 - np.dot(unit, self.participant_unit))
+    
     def match(self, face_roi):
         """
         Match face against cached participant embedding
@@ -300,12 +367,12 @@ class FaceMatcher(BaseDetector):
                 return False
             
             # Compute distance (lower = more similar)
-            distance = self._compute_distance(current_embedding, self.participant_embedding)
+            distance = self._participant_distance(current_embedding)
             
             # Check if match (distance below threshold)
             is_match = distance < self.distance_threshold
             
-            self.logger.debug(f"Match: {is_match}, Distance: {distance:.4f}, Threshold: {self.distance_threshold}")
+            self.logger.debug("Match: %s, Distance: %.4f, Threshold: %s", is_match, distance, self.distance_threshold)
             
             return is_match
             
@@ -346,7 +413,7 @@ class FaceMatcher(BaseDetector):
                 }
             
             # Compute distance (lower = more similar)
-            distance = self._compute_distance(current_embedding, self.participant_embedding)
+            distance = self._participant_distance(current_embedding)
             
             # Compute confidence (inverse of distance, normalized by threshold)
             # Confidence is higher when distance is lower
@@ -411,22 +478,15 @@ class FaceMatcher(BaseDetector):
     
     def cleanup(self):
         """Release DeepFace model and cached embeddings"""
-        print(f"[DEBUG] === ENTERING {self.name}.cleanup() ===")
         try:
-            print(f"[DEBUG] {self.name} Step 0: Clearing embeddings")
             # Clear cached embeddings
             self.participant_embedding = None
-            print(f"[DEBUG] {self.name} Step 1: participant_embedding = None")
+            self.participant_unit = None
             self.embedding_dim = None
-            print(f"[DEBUG] {self.name} Step 2: embedding_dim = None")
             self.initialized = False
-            print(f"[DEBUG] {self.name} Step 3: initialized = False")
             
             # DeepFace models are managed by the library internally
             # Setting to None allows garbage collection
             self.logger.info(f"{self.name} - DeepFace model and embeddings released")
-            print(f"[DEBUG] {self.name} Step 4: Cleanup complete")
         except Exception as e:
-            print(f"[DEBUG] ERROR in {self.name}.cleanup(): {e}")
             self.logger.error(f"Error cleaning up {self.name}: {e}")
-        print(f"[DEBUG] === EXITING {self.name}.cleanup() ===")
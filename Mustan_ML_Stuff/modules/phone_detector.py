@@ -20,7 +20,12 @@ class PhoneDetector(BaseDetector):
         name="PhoneDetector",
         enabled=True,
         model_path="cv_models/phone.pt",
-        confidence_threshold=0.5
+        confidence_threshold=0.5,
+        imgsz=640,
+        batch_size=1,
+        gpu_preprocess=False,
+        use_tensorrt=False,
+        int8_calibration_data=None
     ):
         """
         Initialize phone detector (object detection model)
@@ -30,12 +35,34 @@ class PhoneDetector(BaseDetector):
             enabled: Whether detector is enabled
             model_path: Path to the phone detection model (.pt file)
             confidence_threshold: Minimum confidence for detections (0-1)
+            imgsz: Fixed square inference size; every frame is letterboxed to this shape
+            batch_size: Frames per detect_phones_batch call (the TensorRT engine is built for this batch)
+            gpu_preprocess: Letterbox and normalize frames on the GPU when the model runs on CUDA
+            use_tensorrt: Load (and export if missing) a TensorRT engine when CUDA is available
+            int8_calibration_data: Dataset YAML with representative frames for INT8 calibration (None = FP16 engine)
         """
         super().__init__(name, enabled)
         
         self.model_path = model_path
         self.confidence_threshold = confidence_threshold
+        self.imgsz = imgsz
+        self.batch_size = max(1, int(batch_size))
+        self.gpu_preprocess = gpu_preprocess
+        self.use_tensorrt = use_tensorrt
+        self.int8_calibration_data = int8_calibration_data
         self.model = None
+        self.device = 'cpu'  # Switched to the GPU when CUDA is available
+        self.half = False  # FP16 inference for the PyTorch model on tensor-core GPUs
+        
+        # Label text sizes for the drawing path; confidence labels are rounded to two
+        # decimals, so there are at most ~100 distinct strings
+        self._label_sizes = {}
+        
+        # Persistent buffers for GPU preprocessing (pinned host staging + device canvas)
+        self._pinned_frame = None
+        self._gpu_frame = None
+        self._gpu_canvas = None
+        self._gpu_canvas_key = None
         self.class_names = {0: 'phone'}  # Single class detection
         
         # Statistics tracking
@@ -60,8 +87,17 @@ class PhoneDetector(BaseDetector):
                 self.logger.error(f"Model file not found: {self.model_path}")
                 return False
             
+            # Prefer a TensorRT engine when requested and available
+            engine_path = self._prepare_tensorrt_engine() if self.use_tensorrt else None
+            
             # Load the YOLO detection model
-            self.model = YOLO(self.model_path)
+            if engine_path:
+                self.model = YOLO(engine_path, task='detect')
+                self.device = 0
+                self.logger.info(f"Using TensorRT engine: {engine_path}")
+            else:
+                self.model = YOLO(self.model_path)
+                self._configure_torch_device()
             
             # Verify model loaded correctly
             if self.model is None:
@@ -83,6 +119,126 @@ class PhoneDetector(BaseDetector):
             self.model = None
             return False
     
+    def _configure_torch_device(self):
+        """
+        Place the PyTorch model on the GPU when CUDA is available, using FP16 and
+        channels_last on tensor-core GPUs (compute capability 7.0+)
+        """
+        try:
+            import torch
+            
+            if not torch.cuda.is_available():
+                return
+            
+            self.device = 0
+            if torch.cuda.get_device_capability(0)[0] >= 7:
+                self.half = True
+                self.model.model.to(memory_format=torch.channels_last)
+                self.logger.info("Phone model using CUDA with FP16 and channels_last")
+            else:
+                self.logger.info("Phone model using CUDA (FP32)")
+                
+        except Exception as e:
+            self.logger.warning(f"Could not configure CUDA for phone model, using CPU: {e}")
+            self.device = 'cpu'
+            self.half = False
+    
+    def _prepare_tensorrt_engine(self):
+        """
+        Locate the cached TensorRT engine next to the .pt model, exporting it once if missing
+        
+        An INT8 engine is used when one exists or calibration data is configured;
+        otherwise an FP16 engine is built, which needs no calibration
+        
+        Returns:
+            str or None: Path to the engine, or None to fall back to the PyTorch model
+        """
+        try:
+            import os
+            import torch
+            from ultralytics import YOLO
+            
+            if not torch.cuda.is_available():
+                self.logger.info("CUDA not available, using PyTorch phone model")
+                return None
+            
+            stem = os.path.splitext(self.model_path)[0]
+            if self.batch_size > 1:
+                stem = f"{stem}_b{self.batch_size}"
+            int8_engine_path = f"{stem}_int8_{self.imgsz}.engine"
+            if os.path.exists(int8_engine_path):
+                return int8_engine_path
+            
+            if self.int8_calibration_data:
+                engine_path = int8_engine_path
+                precision_args = {'int8': True, 'data': self.int8_calibration_data}
+            else:
+                engine_path = f"{stem}_fp16_{self.imgsz}.engine"
+                if os.path.exists(engine_path):
+                    return engine_path
+                precision_args = {'half': True}
+            
+            self.logger.info(f"Exporting TensorRT engine (one-time) to {engine_path}...")
+            exported_path = YOLO(self.model_path).export(
+                format='engine',
+                imgsz=self.imgsz,
+                dynamic=False,
+                batch=self.batch_size,
+                workspace=2,
+                device=0,
+                **precision_args
+            )
+            os.replace(exported_path, engine_path)
+            return engine_path
+            
+        except Exception as e:
+            self.logger.error(f"TensorRT export failed, using PyTorch phone model: {e}")
+            return None
+    
+    def _parse_result(self, result, letterbox=None):
+        """
+        Convert one YOLO result into detection dicts
+        
+        Args:
+            result: Ultralytics Results object for a single image
+            letterbox: (scale, pad_x, pad_y, w, h) when the input was letterboxed by
+                       _preprocess_gpu, to map boxes back to frame coordinates
+            
+        Returns:
+            list: Detections in the format documented on detect_phones
+        """
+        # Check if boxes attribute exists
+        if not hasattr(result, 'boxes') or result.boxes is None:
+            return []
+        
+        # One device->host transfer for all boxes: rows of (x1, y1, x2, y2, conf, cls)
+        box_data = result.boxes.data[:, :6].cpu().numpy()
+        
+        # Derive integer boxes, centers and areas for all boxes at once
+        xyxy = box_data[:, :4]
+        if letterbox is not None:
+            scale, pad_x, pad_y, w, h = letterbox
+            xyxy = (xyxy - np.array([pad_x, pad_y, pad_x, pad_y], dtype=xyxy.dtype)) / scale
+            xyxy = np.clip(xyxy, 0, [w, h, w, h])
+        bboxes = xyxy.astype(int).tolist()
+        centers = ((xyxy[:, :2] + xyxy[:, 2:]) / 2).astype(int).tolist()
+        areas = ((xyxy[:, 2] - xyxy[:, 0]) * (xyxy[:, 3] - xyxy[:, 1])).astype(int).tolist()
+        confidences = box_data[:, 4].tolist()
+        class_ids = box_data[:, 5].astype(int).tolist()
+        
+        return [
+            {
+                'bbox': bbox,
+                'confidence': confidence,
+                'class_id': class_id,
+                'class_name': self.class_names.get(class_id, 'phone'),
+                'center': center,
+                'area': area
+            }
+            for bbox, confidence, class_id, center, area
+            in zip(bboxes, confidences, class_ids, centers, areas)
+        ]
+    
     def detect_phones(self, frame):
         """
         Detect phones in the frame with bounding boxes
@@ -111,12 +267,19 @@ class PhoneDetector(BaseDetector):
             return []
         
         try:
+            # Letterbox on the GPU so only the raw frame crosses PCIe
+            source, letterbox = frame, None
+            if self.gpu_preprocess and self.device != 'cpu':
+                source, letterbox = self._preprocess_gpu(frame)
+            
             # Run YOLO object detection
             results = self.model(
-                frame,
+                source,
                 conf=self.confidence_threshold,
+                imgsz=self.imgsz,
                 verbose=False,
-                device='cpu'  # Change to 'cuda' for GPU
+                device=self.device,
+                half=self.half
             )
             
             # Check if results is None or empty
@@ -124,36 +287,7 @@ class PhoneDetector(BaseDetector):
                 return []
             
             # Get first result (single image)
-            result = results[0]
-            
-            # Check if boxes attribute exists
-            if not hasattr(result, 'boxes') or result.boxes is None:
-                return []
-            
-            detections = []
-            
-            # Process each detected phone
-            for box in result.boxes:
-                # Extract detection information
-                confidence = float(box.conf[0])
-                class_id = int(box.cls[0])
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                
-                # Calculate additional properties
-                x_center = int((x1 + x2) / 2)
-                y_center = int((y1 + y2) / 2)
-                area = int((x2 - x1) * (y2 - y1))
-                
-                detection = {
-                    'bbox': [int(x1), int(y1), int(x2), int(y2)],
-                    'confidence': confidence,
-                    'class_id': class_id,
-                    'class_name': self.class_names.get(class_id, 'phone'),
-                    'center': [x_center, y_center],
-                    'area': area
-                }
-                
-                detections.append(detection)
+            detections = self._parse_result(results[0], letterbox)
             
             # Update statistics
             if len(detections) > 0:
@@ -165,13 +299,118 @@ class PhoneDetector(BaseDetector):
             self.logger.error(f"Error detecting phones: {e}", exc_info=True)
             return []
     
-    def process_frame(self, frame, draw=True):
+    def _preprocess_gpu(self, frame):
+        """
+        Letterbox a BGR frame to imgsz and normalize it on the GPU
+        
+        Args:
+            frame: Input frame (numpy array BGR, uint8)
+            
+        Returns:
+            tuple: (tensor (1, 3, imgsz, imgsz) RGB in [0, 1], (scale, pad_x, pad_y, w, h))
+        """
+        import torch
+        import torch.nn.functional as F
+        
+        h, w = frame.shape[:2]
+        scale = self.imgsz / max(h, w)
+        new_w, new_h = int(round(w * scale)), int(round(h * scale))
+        pad_x = (self.imgsz - new_w) // 2
+        pad_y = (self.imgsz - new_h) // 2
+        
+        # Stage the frame in pinned memory and upload it into a persistent device
+        # buffer, so steady state does no host or device allocations
+        device = f"cuda:{self.device}"
+        if self._pinned_frame is None or tuple(self._pinned_frame.shape) != frame.shape:
+            self._pinned_frame = torch.empty(frame.shape, dtype=torch.uint8).pin_memory()
+            self._gpu_frame = torch.empty(frame.shape, dtype=torch.uint8, device=device)
+        np.copyto(self._pinned_frame.numpy(), frame)
+        self._gpu_frame.copy_(self._pinned_frame, non_blocking=True)
+        
+        # Build the input directly in the dtype the model runs in, avoiding a later cast
+        dtype = self._gpu_input_dtype()
+        
+        # HWC BGR uint8 -> 1CHW RGB in [0, 1]
+        src = self._gpu_frame.flip(-1).permute(2, 0, 1).unsqueeze(0).to(dtype).div_(255.0)
+        resized = F.interpolate(src, size=(new_h, new_w), mode='bilinear', align_corners=False)
+        
+        # Grey (114) padding, matching Ultralytics' letterbox; the border only needs
+        # filling when the canvas or the letterbox geometry changes
+        canvas_key = (dtype, new_h, new_w)
+        if self._gpu_canvas is None or self._gpu_canvas_key != canvas_key:
+            self._gpu_canvas = torch.full(
+                (1, 3, self.imgsz, self.imgsz), 114 / 255.0, dtype=dtype, device=device
+            )
+            self._gpu_canvas_key = canvas_key
+        self._gpu_canvas[:, :, pad_y:pad_y + new_h, pad_x:pad_x + new_w] = resized
+        
+        return self._gpu_canvas, (scale, pad_x, pad_y, w, h)
+    
+    def _gpu_input_dtype(self):
+        """
+        Tensor dtype the loaded model consumes: FP16 for half-precision PyTorch models
+        and FP16 TensorRT engines (known once Ultralytics has set up its predictor)
+        
+        Returns:
+            torch.dtype: torch.float16 or torch.float32
+        """
+        import torch
+        
+        predictor = getattr(self.model, 'predictor', None)
+        backend = getattr(predictor, 'model', None)
+        if self.half or getattr(backend, 'fp16', False):
+            return torch.float16
+        return torch.float32
+    
+    def detect_phones_batch(self, frames):
+        """
+        Detect phones in several frames with a single model call
+        
+        Args:
+            frames: List of input frames (numpy arrays)
+            
+        Returns:
+            list: One detection list per frame (same format as detect_phones)
+        """
+        self.total_frames += len(frames)
+        
+        if not self.initialized or self.model is None:
+            self.logger.debug(f"Phone detector not initialized")
+            return [[] for _ in frames]
+        
+        try:
+            # Run YOLO object detection on the whole batch
+            results = self.model(
+                frames,
+                conf=self.confidence_threshold,
+                imgsz=self.imgsz,
+                verbose=False,
+                device=self.device,
+                half=self.half
+            )
+            
+            if results is None or len(results) != len(frames):
+                return [[] for _ in frames]
+            
+            batch_detections = [self._parse_result(result) for result in results]
+            
+            # Update statistics
+            self.phone_detected_frames += sum(1 for detections in batch_detections if detections)
+            
+            return batch_detections
+            
+        except Exception as e:
+            self.logger.error(f"Error detecting phones in batch: {e}", exc_info=True)
+            return [[] for _ in frames]
+    
+    def process_frame(self, frame, draw=True, in_place=False):
         """
         Process frame: detect phones and optionally draw bounding boxes
         
         Args:
             frame: Input frame
             draw: Whether to draw bounding boxes and labels
+            in_place: Draw directly on frame instead of a copy (for caller-owned scratch buffers)
             
         Returns:
             tuple: (annotated_frame, detection_results)
@@ -181,7 +420,42 @@ class PhoneDetector(BaseDetector):
         
         # Detect phones
         detections = self.detect_phones(frame)
+        return self._finish_frame(frame, detections, draw, in_place)
+    
+    def process_frames(self, frames, draw=False, in_place=False):
+        """
+        Process several frames with one batched model call (see detect_phones_batch)
         
+        Args:
+            frames: List of input frames
+            draw: Whether to draw bounding boxes and labels
+            in_place: Draw directly on each frame instead of a copy
+            
+        Returns:
+            list: (annotated_frame, detection_results) per frame, as from process_frame
+        """
+        if not self.enabled:
+            return [(frame, {"enabled": False}) for frame in frames]
+        
+        batch_detections = self.detect_phones_batch(frames)
+        return [
+            self._finish_frame(frame, detections, draw, in_place)
+            for frame, detections in zip(frames, batch_detections)
+        ]
+    
+    def _finish_frame(self, frame, detections, draw, in_place=False):
+        """
+        Build the detection results for one frame and optionally annotate it
+        
+        Args:
+            frame: Input frame
+            detections: Detections for the frame (format documented on detect_phones)
+            draw: Whether to draw bounding boxes and labels
+            in_place: Draw directly on frame instead of a copy
+            
+        Returns:
+            tuple: (annotated_frame, detection_results)
+        """
         # Build results dictionary
         detection_results = {
             "detector": self.name,
@@ -192,10 +466,11 @@ class PhoneDetector(BaseDetector):
             "alert": len(detections) > 0  # Alert if any phone detected
         }
         
-        output_frame = frame.copy()
+        output_frame = frame
         
-        # Draw bounding boxes if enabled
+        # Draw bounding boxes if enabled (on a copy unless in_place, so the caller's frame stays clean)
         if draw and len(detections) > 0:
+            output_frame = frame if in_place else frame.copy()
             for detection in detections:
                 x1, y1, x2, y2 = detection['bbox']
                 confidence = detection['confidence']
@@ -207,7 +482,10 @@ class PhoneDetector(BaseDetector):
                 
                 # Draw label with confidence
                 label = f"Phone {confidence:.2f}"
-                label_size, _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+                label_size = self._label_sizes.get(label)
+                if label_size is None:
+                    label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+                    self._label_sizes[label] = label_size
                 
                 # Draw label background
                 cv2.rectangle(
@@ -242,12 +520,11 @@ class PhoneDetector(BaseDetector):
                 2
             )
         
-        # Log if phone detected
-        if len(detections) > 0:
-            max_conf = max([d['confidence'] for d in detections])
-            self.logger.warning(
-                f"ALERT: {len(detections)} phone(s) detected "
-                f"(max confidence: {max_conf:.2%})"
+        # Per-frame detail only; alerts are recorded by the pipeline's session logger
+        if detections and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "ALERT: %d phone(s) detected (max confidence: %.2f%%)",
+                len(detections), detection_results["confidence"] * 100
             )
         
         return output_frame, detection_results
@@ -6,10 +6,13 @@ Supports shared memory buffer for zero-copy frame sharing with frontend
 
 import logging
 import cv2
+from collections import Counter, deque
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 from .camera_pipeline import CameraPipeline
 from .base_detector import BaseDetector
+from .display import blit_text_sprite
 from .proctor_logger import ProctorLogger
 from .alert_communicator import AlertCommunicator
 from .shared_frame_buffer import SharedFrameBuffer
@@ -43,8 +46,14 @@ class ProctorPipeline(CameraPipeline):
         self.face_matcher = None
         self.eye_detector = None
         self.phone_detector = None
-        self.frame_skip = frame_skip
-        self.frame_counter = 0
+        self.frame_skip = frame_skip  # Overrides config.FRAME_SKIP in the base class
+        
+        # Frames queued for batched phone detection (PHONE_BATCH_SIZE > 1)
+        self._phone_batch = []
+        self._phone_batch_detected = False
+        
+        # Worker running the phone model concurrently with the face/eye stages (PHONE_PARALLEL_DETECTION)
+        self._phone_pool = None
         
         # Session logger
         self.session_logger = ProctorLogger(
@@ -83,7 +92,9 @@ class ProctorPipeline(CameraPipeline):
             "total_frames_captured": 0,
             "total_frames_processed": 0,
             "detections": {},
-            "alerts": []
+            # Recent alerts only (bounded); per-type totals are kept in alert_counts
+            "alerts": deque(maxlen=getattr(config, 'MAX_ALERT_HISTORY', 1000)),
+            "alert_counts": Counter()
         }
         
         
@@ -103,7 +114,11 @@ class ProctorPipeline(CameraPipeline):
                     enabled=True,
                     model_selection=getattr(self.config, 'FACE_MODEL_SELECTION', 1),
                     min_detection_confidence=getattr(self.config, 'FACE_MIN_DETECTION_CONFIDENCE', 0.7),
-                    min_tracking_confidence=getattr(self.config, 'FACE_MIN_TRACKING_CONFIDENCE', 0.5)
+                    min_tracking_confidence=getattr(self.config, 'FACE_MIN_TRACKING_CONFIDENCE', 0.5),
+                    max_input_width=getattr(self.config, 'FACE_DETECT_MAX_INPUT_WIDTH', None),
+                    delegate=getattr(self.config, 'FACE_DETECT_DELEGATE', 'CPU'),
+                    reuse_threshold=getattr(self.config, 'FACE_DETECT_REUSE_THRESHOLD', None),
+                    detect_stride=getattr(self.config, 'FACE_DETECT_STRIDE', 1)
                 )
                 
                 if self.face_detector.load_model(getattr(self.config, 'FACE_MARKER_MODEL_PATH', None)):
@@ -127,7 +142,8 @@ class ProctorPipeline(CameraPipeline):
                     model_name=getattr(self.config, 'FACE_MATCHING_BACKEND', 'Facenet'),
                     distance_metric=getattr(self.config, 'FACE_MATCHING_DISTANCE_METRIC', 'cosine'),
                     distance_threshold=getattr(self.config, 'FACE_MATCHING_THRESHOLD', 0.5),
-                    participant_image_path=getattr(self.config, 'PARTICIPANT_DATA_PATH', 'data/participant.png')
+                    participant_image_path=getattr(self.config, 'PARTICIPANT_DATA_PATH', 'data/participant.png'),
+                    embedding_cache_dir=getattr(self.config, 'FACE_EMBEDDING_CACHE_DIR', None)
                 )
                 
                 if self.face_matcher.load_model():
@@ -179,13 +195,23 @@ class ProctorPipeline(CameraPipeline):
                     name="PhoneDetector",
                     enabled=True,
                     model_path=getattr(self.config, 'PHONE_MODEL_PATH', 'cv_models/phone.pt'),
-                    confidence_threshold=getattr(self.config, 'PHONE_CONFIDENCE_THRESHOLD', 0.5)
+                    confidence_threshold=getattr(self.config, 'PHONE_CONFIDENCE_THRESHOLD', 0.5),
+                    imgsz=getattr(self.config, 'PHONE_IMGSZ', 640),
+                    batch_size=getattr(self.config, 'PHONE_BATCH_SIZE', 1),
+                    gpu_preprocess=getattr(self.config, 'PHONE_GPU_PREPROCESS', False),
+                    use_tensorrt=getattr(self.config, 'PHONE_USE_TENSORRT', False),
+                    int8_calibration_data=getattr(self.config, 'PHONE_INT8_CALIBRATION_DATA', None)
                 )
                 
                 if self.phone_detector.load_model():
                     self.detectors['PhoneDetector'] = self.phone_detector
                     self.proctoring_results["detections"]['PhoneDetector'] = []
                     self.logger.info("✓ Phone Detector loaded successfully")
+                    
+                    # The torch/ultralytics forward pass releases the GIL, so it can overlap MediaPipe
+                    if getattr(self.config, 'PHONE_PARALLEL_DETECTION', False) and self.phone_detector.batch_size == 1:
+                        self._phone_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PhoneDetector")
+                        self.logger.info("Phone detection will run in parallel with face detection")
                 else:
                     self.logger.error("✗ Failed to load Phone Detector")
                     self.phone_detector = None
@@ -249,6 +275,26 @@ class ProctorPipeline(CameraPipeline):
         return False
 
     
+    def skip_frame(self):
+        """Count a frame that was grabbed but not decoded"""
+        super().skip_frame()
+        self.proctoring_results["total_frames_captured"] += 1
+    
+    def process_skipped_frame(self, frame):
+        """
+        Handle a frame skipped by frame_skip: count it and show it live with a skip marker
+        
+        Args:
+            frame: Input frame from camera
+            
+        Returns:
+            Frame as-is, with a skip overlay when the feed is displayed
+        """
+        self.proctoring_results["total_frames_captured"] += 1
+        if getattr(self.config, 'DISPLAY_FEED', True):
+            return self._add_skip_overlay(frame)
+        return frame
+    
     def process_frame(self, frame):
         """
         Process frame with SEQUENTIAL pipeline:
@@ -264,18 +310,6 @@ class ProctorPipeline(CameraPipeline):
             Processed frame with annotations
         """
         self.proctoring_results["total_frames_captured"] += 1
-        self.frame_counter += 1
-        
-        # Check if we should process this frame
-        if self.frame_counter <= self.frame_skip:
-            # Skip processing, return frame as-is (no overlay if display is disabled)
-            if getattr(self.config, 'DISPLAY_FEED', True):
-                return self._add_skip_overlay(frame)
-            else:
-                return frame
-        
-        # Reset counter
-        self.frame_counter = 0
         self.proctoring_results["total_frames_processed"] += 1
         self.session_logger.log_frame_processed()
         
@@ -289,6 +323,11 @@ class ProctorPipeline(CameraPipeline):
             except Exception as e:
                 self.logger.error(f"Error writing frame to shared buffer: {e}")
         
+        # Launch phone detection first so it overlaps steps 1-4 (frame is only read)
+        phone_future = None
+        if self._phone_pool is not None and self.phone_detector and self.phone_detector.enabled:
+            phone_future = self._phone_pool.submit(self.phone_detector.process_frame, frame, False)
+        
         # STEP 1: MediaPipe face detector gets faces
         face_meshes = []
         if self.face_detector and self.face_detector.enabled:
@@ -300,6 +339,7 @@ class ProctorPipeline(CameraPipeline):
         
         num_faces = len(face_meshes)
         verification_result = None
+        alert_updates = {}  # Alert communicator changes, applied together after all steps
         eye_result = None
         
         # STEP 2: Multiple faces alert
@@ -313,7 +353,7 @@ class ProctorPipeline(CameraPipeline):
                 'warning',
                 {'num_faces': num_faces}
             )
-            self.proctoring_results["alerts"].append({
+            self._record_alert({
                 "timestamp": time.time(),
                 "type": "multiple_faces",
                 "message": alert_msg,
@@ -321,8 +361,8 @@ class ProctorPipeline(CameraPipeline):
             })
             
             # Update alert communicator
-            self.alert_comm.set_multiple_faces(True)
-            self.alert_comm.set_no_face(False)  # Clear no face if multiple detected
+            alert_updates['multi_face'] = True
+            alert_updates['no_face'] = False  # Clear no face if multiple detected
         elif num_faces == 0:
             # No face detected - LOG ALERT & UPDATE ALERT STATE
             alert_msg = "No face detected"
@@ -332,7 +372,7 @@ class ProctorPipeline(CameraPipeline):
                 alert_msg,
                 'warning'
             )
-            self.proctoring_results["alerts"].append({
+            self._record_alert({
                 "timestamp": time.time(),
                 "type": "no_face",
                 "message": alert_msg,
@@ -340,12 +380,12 @@ class ProctorPipeline(CameraPipeline):
             })
             
             # Update alert communicator
-            self.alert_comm.set_no_face(True)
-            self.alert_comm.set_multiple_faces(False)  # Clear multiple if none detected
+            alert_updates['no_face'] = True
+            alert_updates['multi_face'] = False  # Clear multiple if none detected
         elif num_faces == 1:
             # Clear face count alerts (single face is good)
-            self.alert_comm.set_no_face(False)
-            self.alert_comm.set_multiple_faces(False)
+            alert_updates['no_face'] = False
+            alert_updates['multi_face'] = False
             
             # STEP 3: If single face then verify
             if self.face_matcher and self.face_matcher.enabled:
@@ -371,7 +411,7 @@ class ProctorPipeline(CameraPipeline):
                             if "RISK" in status:
                                 eye_risk_detected = True
                                 alert_msg = f"Suspicious eye movement detected: {detection.get('eye_name', 'Unknown')} eye - {status}"
-                                self.proctoring_results["alerts"].append({
+                                self._record_alert({
                                     "timestamp": time.time(),
                                     "type": "eye_movement",
                                     "message": alert_msg,
@@ -382,23 +422,40 @@ class ProctorPipeline(CameraPipeline):
                         eye_result = eye_detections
                     
                     # Update alert communicator
-                    self.alert_comm.set_eye_movement(eye_risk_detected)
+                    alert_updates['eye_movement'] = eye_risk_detected
                 except Exception as e:
                     self.logger.error(f"Error during eye detection: {e}")
                     self.session_logger.log_alert('eye_detection_error', f"Eye detection failed: {e}", 'info')
             else:
                 # Clear eye movement alert if detector disabled
-                self.alert_comm.set_eye_movement(False)
+                alert_updates['eye_movement'] = False
         
         # STEP 5: Check for phone detection
+        # The face detector gates the (much more expensive) phone model: with no
+        # face in view the no-face alert is already raised, so YOLO is skipped
         phone_detected = False
-        if self.phone_detector and self.phone_detector.enabled:
+        skip_phone = (
+            phone_future is None
+            and num_faces == 0
+            and getattr(self.config, 'PHONE_SKIP_WITHOUT_FACE', False)
+            and self.face_detector is not None
+            and self.face_detector.enabled
+        )
+        if self.phone_detector and self.phone_detector.enabled and not skip_phone:
             try:
                 # Process frame for phone detection
-                _, phone_result = self.phone_detector.process_frame(frame, draw=False)
+                if phone_future is not None:
+                    _, phone_result = phone_future.result()
+                elif self.phone_detector.batch_size > 1:
+                    phone_result = self._detect_phones_batched(frame)
+                else:
+                    _, phone_result = self.phone_detector.process_frame(frame, draw=False)
                 
                 # Check if phone was detected (alert flag)
-                if phone_result.get('alert', False):
+                if phone_result is None:
+                    # Batch still filling: keep the state of the last evaluated batch
+                    phone_detected = self._phone_batch_detected
+                elif phone_result.get('alert', False):
                     phone_detected = True
                     
                     # Log critical alert
@@ -408,23 +465,24 @@ class ProctorPipeline(CameraPipeline):
                         'critical',
                         phone_result  # Metadata stored but not logged
                     )
-                    self.proctoring_results["alerts"].append({
+                    self._record_alert({
                         "timestamp": time.time(),
                         "type": "cheating_phone_detected",
                         "message": "Phone detected",
                         "severity": "critical"
                     })
                 
-                # Update alert communicator (critical alert, force=True)
-                self.alert_comm.set_phone_detected(phone_detected)
+                # Update alert communicator (critical alert, bypasses the cooldown)
+                alert_updates['phone'] = phone_detected
             except Exception as e:
                 self.logger.error(f"Error during phone detection: {e}")
                 self.session_logger.log_alert('phone_detection_error', f"Phone detection failed: {e}", 'info')
         else:
-            # Clear phone alert if detector disabled
-            self.alert_comm.set_phone_detected(False)
+            # Clear phone alert if detector disabled or skipped for this frame
+            alert_updates['phone'] = False
         
-        # Flush alert state to file if needed (debounced)
+        # Apply this frame's alert changes in one update, then flush to file if needed (debounced)
+        self.alert_comm.update(**alert_updates)
         self.alert_comm.flush_if_needed()
     
         # Draw annotations regardless of DISPLAY_FEED (needed for shared memory preview)
@@ -436,7 +494,8 @@ class ProctorPipeline(CameraPipeline):
                 annotated_frame, 
                 face_meshes,
                 show_all_landmarks=show_all,
-                show_landmark_numbers=show_nums
+                show_landmark_numbers=show_nums,
+                in_place=True  # annotated_frame is already this pipeline's own copy
             )
         
         # Draw eye detection results if available
@@ -452,6 +511,35 @@ class ProctorPipeline(CameraPipeline):
         
         return annotated_frame
     
+    def _detect_phones_batched(self, frame):
+        """
+        Queue a frame for batched phone detection and run the model once the batch is full
+        
+        Args:
+            frame: Input frame
+            
+        Returns:
+            dict or None: Combined phone result for the batch, None while the batch is filling
+        """
+        self._phone_batch.append(frame)
+        if len(self._phone_batch) < self.phone_detector.batch_size:
+            return None
+        
+        batch_detections = self.phone_detector.detect_phones_batch(self._phone_batch)
+        self._phone_batch = []
+        
+        detections = [d for frame_detections in batch_detections for d in frame_detections]
+        self._phone_batch_detected = len(detections) > 0
+        
+        return {
+            "detector": self.phone_detector.name,
+            "phone_detected": self._phone_batch_detected,
+            "count": len(detections),
+            "confidence": max([d['confidence'] for d in detections], default=0.0),
+            "detections": detections,
+            "alert": self._phone_batch_detected
+        }
+    
     def _verify_face_sequential(self, frame, face_data):
         """
         Sequential face verification (no threading)
@@ -519,13 +607,10 @@ class ProctorPipeline(CameraPipeline):
             phone_detected: Whether phone was detected
             
         Returns:
-            Frame with overlay
+            Frame with overlay (drawn in place)
         """
-        overlay = frame.copy()
-        y_offset = 25
-        line_height = 25
-        font_scale = 0.5
-        font_thickness = 1
+        # frame is process_frame's annotated copy, so the status lines go onto it directly
+        overlay = frame
         
         # Calculate FPS
         fps_text = "FPS: --"
@@ -535,17 +620,9 @@ class ProctorPipeline(CameraPipeline):
                 fps = self._fps_frame_count / elapsed
                 fps_text = f"FPS: {fps:.1f}"
         
-        # 1. FPS Display
-        cv2.putText(
-            overlay,
-            fps_text,
-            (10, y_offset),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            font_scale,
-            (255, 255, 255),
-            font_thickness
-        )
-        y_offset += line_height
+        # 1. FPS Display (changes every frame, so it is rasterized directly)
+        cv2.putText(overlay, fps_text, (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        lines = []
         
         # 2. Face Verification Status
         if num_faces > 1:
@@ -567,30 +644,18 @@ class ProctorPipeline(CameraPipeline):
             face_text = "CHECKING..."
             face_color = (255, 255, 0)  # Yellow
         
-        cv2.putText(
-            overlay,
-            face_text,
-            (10, y_offset),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            font_scale,
-            face_color,
-            font_thickness
-        )
-        y_offset += line_height
+        lines.append((face_text, face_color))
         
         # 3. Phone Detection Status
         if phone_detected:
-            phone_text = "PHONE DETECTED!"
-            phone_color = (0, 0, 255)  # Red
-            cv2.putText(
-                overlay,
-                phone_text,
-                (10, y_offset),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                font_scale,
-                phone_color,
-                font_thickness
-            )
+            lines.append(("PHONE DETECTED!", (0, 0, 255)))  # Red
+        
+        # Blit the status lines from cached sprites, stacked below the FPS line
+        y_offset = 50
+        line_height = 25
+        for text, color in lines:
+            blit_text_sprite(overlay, ((text, 0, 0.5, 1),), color, (10, y_offset))
+            y_offset += line_height
         
         return overlay
     
@@ -657,7 +722,7 @@ class ProctorPipeline(CameraPipeline):
                     "message": f"Multiple faces detected: {num_faces}",
                     "severity": "warning"
                 }
-                self.proctoring_results["alerts"].append(alert)
+                self._record_alert(alert)
                 self.logger.warning(f"ALERT: {alert['message']}")
             elif num_faces == 0:
                 alert = {
@@ -667,7 +732,7 @@ class ProctorPipeline(CameraPipeline):
                     "message": "No face detected",
                     "severity": "warning"
                 }
-                self.proctoring_results["alerts"].append(alert)
+                self._record_alert(alert)
                 self.logger.warning(f"ALERT: {alert['message']}")
     
     def _add_proctoring_overlay(self, frame, frame_detections):
@@ -751,21 +816,25 @@ class ProctorPipeline(CameraPipeline):
                 )
             },
             "detectors": self.list_detectors(),
-            "alerts": self.proctoring_results["alerts"],
+            "alerts": list(self.proctoring_results["alerts"]),
             "alert_summary": self._get_alert_summary()
         }
         
         return report
     
+    def _record_alert(self, alert):
+        """
+        Add an alert to the bounded recent-alert history and count it by type
+        
+        Args:
+            alert: Alert dictionary with at least a 'type' key
+        """
+        self.proctoring_results["alerts"].append(alert)
+        self.proctoring_results["alert_counts"][alert.get("type", "unknown")] += 1
+    
     def _get_alert_summary(self):
-        """Generate summary of alerts"""
-        summary = {}
-        for alert in self.proctoring_results["alerts"]:
-            alert_type = alert.get("type", "unknown")
-            if alert_type not in summary:
-                summary[alert_type] = 0
-            summary[alert_type] += 1
-        return summary
+        """Generate summary of alerts (counts over the whole session)"""
+        return dict(self.proctoring_results["alert_counts"])
     
     def start(self):
         """
@@ -831,34 +900,32 @@ class ProctorPipeline(CameraPipeline):
     
     def cleanup(self):
         """Cleanup resources (override from CameraPipeline)"""
-        print("\n[DEBUG] === ENTERING ProctorPipeline.cleanup() ===")
-        print("[DEBUG] Step 0: Starting cleanup")
+        
+        # Let a running phone detection finish before any detector model is released
+        if self._phone_pool is not None:
+            self._phone_pool.shutdown(wait=True)
+            self._phone_pool = None
         
         # Close shared memory buffer
         try:
             if hasattr(self, 'frame_buffer') and self.frame_buffer:
-                print("[DEBUG] Step 0.5: Closing shared memory buffer")
                 self.frame_buffer.cleanup()
-                print("[DEBUG] Step 0.6: Shared memory buffer closed")
                 self.logger.info("Shared memory buffer closed and cleaned up")
         except Exception as e:
-            print(f"[DEBUG] ERROR closing shared memory buffer: {e}")
             self.logger.error(f"Error closing shared memory buffer: {e}")
         
         try:
-            print("[DEBUG] Step 1: Generating final report")
             # Generate final report
             self.logger.info("Generating final proctoring report...")
             report = self.get_proctoring_report()
             
-            print("[DEBUG] Step 2: Logging report stats")
             self.logger.info("=" * 60)
             self.logger.info("PROCTORING SESSION REPORT")
             self.logger.info("=" * 60)
             self.logger.info(f"Total Frames Captured: {report['session_stats']['total_frames_captured']}")
             self.logger.info(f"Total Frames Processed: {report['session_stats']['total_frames_processed']}")
             self.logger.info(f"Processing Ratio: {report['session_stats']['processing_ratio']:.2%}")
-            self.logger.info(f"Total Alerts: {len(report['alerts'])}")
+            self.logger.info(f"Total Alerts: {sum(report['alert_summary'].values())}")
             
             if report['alert_summary']:
                 self.logger.info("\nAlert Summary:")
@@ -866,77 +933,52 @@ class ProctorPipeline(CameraPipeline):
                     self.logger.info(f"  - {alert_type}: {count}")
             
             self.logger.info("=" * 60)
-            print("[DEBUG] Step 3: Report generation complete")
         except Exception as e:
-            print(f"[DEBUG] ERROR in report generation: {e}")
             self.logger.error(f"Error generating final report: {e}")
         
         # Close session logger and save
         try:
-            print("[DEBUG] Step 4: Checking session logger")
             if hasattr(self, 'session_logger') and self.session_logger:
-                print("[DEBUG] Step 5: Getting session summary")
                 summary = self.session_logger.get_session_summary()
                 self.logger.info(f"Session logs saved to: {summary['log_file']}")
                 self.logger.info(f"Session alerts saved to: {summary['alerts_file']}")
-                print("[DEBUG] Step 6: Closing session logger")
                 self.session_logger.close()
-                print("[DEBUG] Step 7: Session logger closed")
         except Exception as e:
-            print(f"[DEBUG] ERROR closing session logger: {e}")
             self.logger.error(f"Error closing session logger: {e}")
                 # Force write final alert state and cleanup
         try:
-            print("[DEBUG] Step 7.5: Cleaning up alert communicator")
             if hasattr(self, 'alert_comm') and self.alert_comm:
-                print("[DEBUG] Forcing final alert state write")
                 self.alert_comm.clear_all_alerts()  # Clear all alerts at end
                 self.alert_comm.force_write()  # Force write final state
-                print("[DEBUG] Alert communicator cleaned up")
+                self.alert_comm.close()  # Release the alert file mapping
                 self.logger.info("Alert communicator state saved")
         except Exception as e:
-            print(f"[DEBUG] ERROR cleaning up alert communicator: {e}")
             self.logger.error(f"Error cleaning up alert communicator: {e}")
                 # Cleanup all registered detectors
         try:
-            print("[DEBUG] Step 8: Checking detectors")
             if hasattr(self, 'detectors') and self.detectors:
-                print(f"[DEBUG] Step 9: Found {len(self.detectors)} detectors to clean")
                 self.logger.info("Cleaning up registered detectors...")
                 # Create a list copy to avoid modifying dict during iteration
                 detector_items = list(self.detectors.items())
-                print(f"[DEBUG] Step 10: Created detector list copy with {len(detector_items)} items")
                 
                 for idx, (detector_name, detector) in enumerate(detector_items):
                     try:
-                        print(f"[DEBUG] Step 11.{idx}: Cleaning detector '{detector_name}'")
                         if hasattr(detector, 'cleanup') and callable(detector.cleanup):
                             self.logger.info(f"Cleaning up {detector_name}...")
-                            print(f"[DEBUG] Step 12.{idx}: Calling cleanup() on '{detector_name}'")
                             detector.cleanup()
-                            print(f"[DEBUG] Step 13.{idx}: Cleanup completed for '{detector_name}'")
                         else:
-                            print(f"[DEBUG] Step 12.{idx}: No cleanup method for '{detector_name}'")
                             self.logger.warning(f"{detector_name} has no cleanup method")
                     except Exception as e:
-                        print(f"[DEBUG] ERROR cleaning up {detector_name}: {e}")
                         self.logger.error(f"Error cleaning up {detector_name}: {e}", exc_info=True)
                 
-                print("[DEBUG] Step 14: Clearing detectors dict")
                 self.detectors.clear()
-                print("[DEBUG] Step 15: Detectors cleared")
                 self.logger.info("All detectors cleaned up")
         except Exception as e:
-            print(f"[DEBUG] ERROR during detector cleanup: {e}")
             self.logger.error(f"Error during detector cleanup: {e}", exc_info=True)
         
         # Call parent cleanup (camera and display)
         try:
-            print("[DEBUG] Step 16: Calling parent (CameraPipeline) cleanup")
             super().cleanup()
-            print("[DEBUG] Step 17: Parent cleanup returned")
         except Exception as e:
-            print(f"[DEBUG] ERROR in parent cleanup: {e}")
             self.logger.error(f"Error in parent cleanup: {e}", exc_info=True)
         
-        print("[DEBUG] === EXITING ProctorPipeline.cleanup() ===")
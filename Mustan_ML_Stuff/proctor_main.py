@@ -28,7 +28,7 @@ def main():
     print("\nInitializing proctoring system...")
     
     # Create the proctoring pipeline - detectors auto-load based on config
-    proctor = ProctorPipeline(config=ProctorConfig, frame_skip=ProctorConfig.FRAME_SKIP, session_id=None)
+    proctor = ProctorPipeline(config=ProctorConfig.frozen(), frame_skip=ProctorConfig.FRAME_SKIP, session_id=None)
     
     # Get session info
     session_info = proctor.session_logger.get_session_summary()
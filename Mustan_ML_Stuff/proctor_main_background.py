@@ -38,7 +38,7 @@ def main():
     
     # Create the proctoring pipeline (shared memory buffer auto-configured)
     proctor = ProctorPipeline(
-        config=ProctorConfig,
+        config=ProctorConfig.frozen(),
         frame_skip=ProctorConfig.FRAME_SKIP,
         session_id=None  # Auto-generated
     )